@@ -20,10 +20,16 @@
 #     from and using other widgets which are part of the library. Also
 #     for displaying on screen dialogues like open file and message
 #     boxes as well as creating font objects.
-#   speech_recognition: Speech recognition library used to check if a
-#     working microphone can be found.
+#   functools: Provides partial objects used to give arguments to the
+#     functions called by menu commands and keyboard shortcuts.
+#   speech_recognition: Speech recognition library used to find a
+#     working microphone for voice control to use.
 #   json: Handles the reading and writing of the JSON file which the
 #     settings are stored in to/from a dictionary.
+#   os: Provides access to the filesystem to check if the preferences
+#     file exists before reading it and to replace it when writing.
+#   tempfile: Creates the temporary file the preferences are written to
+#     before it replaces the preferences file.
 
 from IDE.page import Page
 from IDE.settings import Settings
@@ -31,8 +37,62 @@ from IDE.speech import Speech
 from IDE.tree import FileTree
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, font
+from functools import partial
 import speech_recognition as sr
 import json
+import os
+import tempfile
+
+
+class LazyImage:
+    # Lazily loaded image class used for icons of the main window.
+    #
+    # Objects of this class are assigned as class attributes of the main
+    # window and act as descriptors. The image file is only read and a
+    # Tkinter image object created the first time the attribute is accessed,
+    # after which the image object is stored on the window itself so that it
+    # is returned directly by any later access. Used for icons that are not
+    # needed when the window first opens to reduce start up time.
+
+    def __init__(self, path):
+        # Constructor method of lazily loaded image class.
+        #
+        # Parameters:
+        #   path: A string containing the path of the image file to load.
+
+        self.path = path
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        # Set name method called when the object is assigned to a class.
+        #
+        # Stores the attribute name the object was assigned to so the loaded
+        # image can be stored on the window under the same name.
+        #
+        # Parameters:
+        #   owner: The class the object was assigned to.
+        #   name: A string containing the name of the attribute.
+
+        self.name = name
+
+    def __get__(self, window, owner):
+        # Get method called when the attribute is accessed.
+        #
+        # Loads the image file into a Tkinter image object belonging to the
+        # window and stores it as an instance attribute which hides this
+        # object for future accesses. Returns the image object.
+        #
+        # Parameters:
+        #   window: The window the attribute was accessed on or None if it was
+        #     accessed on the class itself.
+        #   owner: The class the object was assigned to.
+
+        if window is None:
+            return self
+
+        image = tk.PhotoImage(master=window, file=self.path)
+        window.__dict__[self.name] = image
+        return image
 
 
 class App(tk.Tk):
@@ -52,6 +112,21 @@ class App(tk.Tk):
     # safely close the window and to show an 'about' dialogue. Includes
     # other helper functions.
 
+    # File types which can be chosen between in the open file dialogue
+    fileTypes = (("Python File", ".py"), ("Text File", ".txt"), ("JSON File", ".json"), ("CSV File", ".csv"), ("All Files", "*"))
+
+    # Microphone button icon image objects which are only loaded when first
+    # shown as most are not needed when the window opens
+    micICO = LazyImage("resources/mic.png")
+    nomicICO = LazyImage("resources/nomic.png")
+    listenICO = LazyImage("resources/listen.png")
+    internetICO = LazyImage("resources/internet.png")
+    nointernetICO = LazyImage("resources/nointernet.png")
+
+    # About window image object which is only loaded when the about window is
+    # first opened
+    bgImg = LazyImage("resources/about.png")
+
     def __init__(self):
         # Constructor method of main window class.
         #
@@ -60,21 +135,33 @@ class App(tk.Tk):
         # it if one is not found. Creates the UI elements used in the main
         # window, such as the menubar, status bar, directory tree, notebook,
         # toolbar and the panes that house them. Sets up important attributes
-        # including the image objects used for toolbar buttons and the about
-        # window, the voice control object and Tkinter variables for disabling
-        # the mic and hiding the directory tree. Also configures binds for
-        # keyboard shortcuts, key to start listening and for syntax
-        # highlighting.
+        # including the image objects used for toolbar buttons (microphone
+        # button icons and the about window image are loaded on first use),
+        # the voice control object and Tkinter variables for disabling the mic
+        # and hiding the directory tree. Also configures the bind for the key to
+        # start listening. Remaining setup is scheduled to run once the window
+        # has been shown.
         #
         # Accepts no parameters.
 
-        try:
-            with open("prefs.json", "r") as prefsFile:
-                self.prefs = json.loads(prefsFile.read())
-        except:
+        # Read the preferences file if one exists, otherwise or if it cannot be
+        # read or parsed use None to mark that defaults are needed
+        self.prefs = None
+        if os.path.exists("prefs.json"):
+            try:
+                with open("prefs.json", "rb") as prefsFile:
+                    self.prefs = json.loads(prefsFile.read())
+            except (OSError, ValueError):
+                self.prefs = None
+
+        if self.prefs is not None:
+            # Store the preferences as they are on disk so they are only
+            # written again if they are changed
+            self.savedPrefs = json.dumps(self.prefs, sort_keys=True, separators=(",", ":"))
+        else:
             self.prefs = {"fontNum": 1, "sizeNum": 5, "font": ["Courier New", 12], "micKilled": False, "treePath": "/", "treeHidden": False}
-            with open("prefs.json", "w") as prefsFile:
-                json.dump(self.prefs, prefsFile)
+            self.savedPrefs = None
+            self.writePrefs()
 
         tk.Tk.__init__(self)
 
@@ -83,50 +170,61 @@ class App(tk.Tk):
         self.treeHidden = tk.BooleanVar(value=self.prefs["treeHidden"])
         self.micKilled = tk.BooleanVar(value=self.prefs["micKilled"])
 
+        # Result of the last check for a working microphone, None until the
+        # first check is performed by the probe mic method, and the microphone
+        # object found by that check for voice control to use
+        self.micAvailable = None
+        self.microphone = None
+
+        # Width and height of the screen used to centre the about window, None
+        # until the about window is first opened
+        self.screenSize = None
+
         # Instantiate a speech object for interacting with voice control
-        speechRec = Speech(self)
+        self.speechRec = Speech(self)
 
         # Define menubar UI element
         menuBar = tk.Menu(self)
 
         # Create the file menu and its commands
         fileMb = tk.Menu(menuBar, tearoff=0)
-        fileMb.add_command(label="New Untitled File", accelerator="Ctrl+N", command=lambda: Page(self.notebook, textFont=self.pageFont))
+        fileMb.add_command(label="New Untitled File", accelerator="Ctrl+N", command=self.newPage)
         fileMb.add_command(label="New Titled File", accelerator="Ctrl+Shift+N", command=lambda: self.tree.dialogue(0))
         fileMb.add_separator()
         fileMb.add_command(label="Open File", accelerator="Ctrl+O", command=self.openFileDialogue)
         fileMb.add_separator()
-        fileMb.add_command(label="Save File", accelerator="Ctrl+S", command=lambda: self.notebook.nametowidget(self.notebook.select()).save())
-        fileMb.add_command(label="Save File As", accelerator="Ctrl+Shift+S", command=lambda: self.notebook.nametowidget(self.notebook.select()).save(True))
+        fileMb.add_command(label="Save File", accelerator="Ctrl+S", command=self.savePage)
+        fileMb.add_command(label="Save File As", accelerator="Ctrl+Shift+S", command=partial(self.savePage, True))
         fileMb.add_separator()
-        fileMb.add_command(label="Close File", accelerator="Ctrl+W", command=lambda: self.notebook.nametowidget(self.notebook.select()).close())
+        fileMb.add_command(label="Close File", accelerator="Ctrl+W", command=self.closePage)
         fileMb.add_command(label="Quit", accelerator="Ctrl+Q", command=self.exit)
 
         # Create the edit menu and its commands
         editMb = tk.Menu(menuBar, tearoff=0)
-        editMb.add_command(label="Undo", accelerator="Ctrl+Z", command=lambda: self.notebook.nametowidget(self.notebook.select()).undoRedo(True))
-        editMb.add_command(label="Redo", accelerator="Ctrl+Y", command=lambda: self.notebook.nametowidget(self.notebook.select()).undoRedo(False))
+        editMb.add_command(label="Undo", accelerator="Ctrl+Z", command=partial(self.undoRedo, True))
+        editMb.add_command(label="Redo", accelerator="Ctrl+Y", command=partial(self.undoRedo, False))
         editMb.add_separator()
-        editMb.add_command(label="Select All", accelerator="Ctrl+A", command=lambda: self.notebook.nametowidget(self.notebook.select()).text.tag_add("sel", "1.0", "end"))
+        editMb.add_command(label="Select All", accelerator="Ctrl+A", command=self.selectAll)
         editMb.add_separator()
-        editMb.add_command(label="Cut", accelerator="Ctrl+X", command=lambda: self.notebook.nametowidget(self.notebook.select()).text.event_generate("<<Cut>>"))
-        editMb.add_command(label="Copy", accelerator="Ctrl+C", command=lambda: self.notebook.nametowidget(self.notebook.select()).text.event_generate("<<Copy>>"))
-        editMb.add_command(label="Paste", accelerator="Ctrl+V", command=lambda: self.notebook.nametowidget(self.notebook.select()).text.event_generate("<<Paste>>"))
+        editMb.add_command(label="Cut", accelerator="Ctrl+X", command=partial(self.textEvent, "<<Cut>>"))
+        editMb.add_command(label="Copy", accelerator="Ctrl+C", command=partial(self.textEvent, "<<Copy>>"))
+        editMb.add_command(label="Paste", accelerator="Ctrl+V", command=partial(self.textEvent, "<<Paste>>"))
         editMb.add_separator()
-        editMb.add_command(label="Preferences", command=lambda: Settings(self))
+        editMb.add_command(label="Preferences", command=partial(Settings, self))
 
         # Create the view menu and its commands
         viewMb = tk.Menu(menuBar, tearoff=0)
-        viewMb.add_command(label="Increase Font Size", accelerator="Ctrl++", command=lambda: self.fontSize(1))
-        viewMb.add_command(label="Decrease Font Size", accelerator="Ctrl+-", command=lambda: self.fontSize(-1))
+        viewMb.add_command(label="Increase Font Size", accelerator="Ctrl++", command=partial(self.fontSize, 1))
+        viewMb.add_command(label="Decrease Font Size", accelerator="Ctrl+-", command=partial(self.fontSize, -1))
         viewMb.add_separator()
         viewMb.add_checkbutton(label="Hide File Browser", variable=self.treeHidden, command=lambda: self.mainPane.paneconfigure(self.mainPane.panes()[0], hide=self.treeHidden.get()))
         viewMb.add_command(label="Swap File Browser Side", command=lambda: self.mainPane.paneconfigure(self.mainPane.panes()[0], after=self.mainPane.panes()[1]))
 
         # Create the microphone menu and its commands
         self.micMb = tk.Menu(menuBar, tearoff=0)
-        self.micMb.add_command(label="Start Listening", command=lambda: speechRec.start())
-        self.micMb.add_checkbutton(label="Disable Microphone", command=lambda: self.killMic())
+        self.micMb.add_command(label="Start Listening", command=self.speechRec.start)
+        self.micMb.add_checkbutton(label="Disable Microphone", command=self.killMic)
+        self.micMb.add_command(label="Refresh Microphone", command=self.refreshMic)
 
         # Create the help menu and its command
         helpMb = tk.Menu(menuBar, tearoff=0)
@@ -163,6 +261,22 @@ class App(tk.Tk):
         notebookFrame = tk.Frame(self)
         self.notebook = ttk.Notebook(notebookFrame)
 
+        # Keep track of the code editor tab currently selected in the notebook
+        # so it does not need to be looked up on every key press or command
+        self.currentPage = None
+        self.notebookPath = str(self.notebook)
+        self.notebook.bind("<<NotebookTabChanged>>", self.tabChanged)
+
+        # Keep a list of all open code editor tabs and map the path of each
+        # open file to its tab so a file that is already open can be found
+        # without checking every tab. Kept up to date by events generated by
+        # the tabs when opened, saved or closed
+        self.pages = []
+        self.pagesByPath = {}
+        self.bind_all("<<PageOpened>>", self.pageOpened)
+        self.bind_all("<<PageSaved>>", self.pageSaved)
+        self.bind_all("<<PageClosed>>", self.pageClosed)
+
         # Create an empty code editor tab in the notebook with the above font
         Page(self.notebook, textFont=self.pageFont)
 
@@ -176,48 +290,18 @@ class App(tk.Tk):
         self.opendirICO = tk.PhotoImage(file="resources/opendir.png")
         self.runICO = tk.PhotoImage(file="resources/run.png")
 
-        # Create different microphone button icon image objects
-        self.micICO = tk.PhotoImage(file="resources/mic.png")
-        self.nomicICO = tk.PhotoImage(file="resources/nomic.png")
-        self.listenICO = tk.PhotoImage(file="resources/listen.png")
-        self.internetICO = tk.PhotoImage(file="resources/internet.png")
-        self.nointernetICO = tk.PhotoImage(file="resources/nointernet.png")
-
-        # Create about window image object
-        self.bgImg = tk.PhotoImage(file="resources/about.png")
-
         # Define each of the toolbar buttons with their appropriate icon and
         # function
-        saveButton = tk.Button(notebookToolbar, image=self.saveICO, relief="groove", command=lambda: self.notebook.nametowidget(self.notebook.select()).save())
-        addButton = tk.Button(notebookToolbar, image=self.addICO, relief="groove", command=lambda: Page(self.notebook, textFont=self.pageFont))
-        closeButton = tk.Button(notebookToolbar, image=self.closeICO, relief="groove", command=lambda: self.notebook.nametowidget(self.notebook.select()).close())
-        opendirButton = tk.Button(notebookToolbar, image=self.opendirICO, relief="groove", command=lambda: self.openFileDialogue())
-        runButton = tk.Button(notebookToolbar, image=self.runICO, relief="groove", command=lambda: self.notebook.nametowidget(self.notebook.select()).run())
+        saveButton = tk.Button(notebookToolbar, image=self.saveICO, relief="groove", command=self.savePage)
+        addButton = tk.Button(notebookToolbar, image=self.addICO, relief="groove", command=self.newPage)
+        closeButton = tk.Button(notebookToolbar, image=self.closeICO, relief="groove", command=self.closePage)
+        opendirButton = tk.Button(notebookToolbar, image=self.opendirICO, relief="groove", command=self.openFileDialogue)
+        runButton = tk.Button(notebookToolbar, image=self.runICO, relief="groove", command=self.runPage)
 
-        # Set appropriate statusbar and microphone button text/icon depending
-        # on whether the microphone is disabled or if isn't, whether one is
-        # available or not
-        if not self.micKilled.get():
-            try:
-                # Working microphone found and enabled
-                sr.Microphone()
-                micText = "Microphone Ready"
-                micImg = self.micICO
-            except OSError:
-                # No working microphone found but enabled
-                micText = "Microphone Offline"
-                self.statusbar.config(text=micText)
-                micImg = self.nomicICO
-        else:
-            # Microphone disabled
-            self.micMb.entryconfig(0, state="disabled")
-            micText = "Microphone Disabled"
-            self.statusbar.config(text="Microphone Disabled by User")
-            micImg = self.nomicICO
-
-        # Define microphone toolbar button with above text and icon used to
-        # display voice control status or toggle microphone on or off
-        self.micButton = tk.Button(notebookToolbar, image=micImg, text=micText, relief="groove", compound="left", command=lambda: self.killMic())
+        # Define microphone toolbar button used to display voice control status
+        # or toggle microphone on or off. Its text and icon are set once the
+        # microphone has been checked for after the window is shown
+        self.micButton = tk.Button(notebookToolbar, relief="groove", compound="left", command=self.killMic)
 
         # Add and position toolbar buttons on the toolbar frame
         saveButton.pack(side="left", padx=5, pady=2)
@@ -243,28 +327,125 @@ class App(tk.Tk):
         self.statusbar.pack(side="bottom", fill="x")
         self.mainPane.pack(fill="both", expand=1)
 
-        # Setup bind for all key releases to trigger syntax highlighting of
-        # current code editor tab
-        self.bind_all("<KeyRelease>", lambda event: self.notebook.nametowidget(self.notebook.select()).syntaxHighlight(event))
-
         # Setup bind to start voice control listening when right shift is
         # pressed
-        self.bind_all("<Shift_R>", lambda event: speechRec.start())
-
-        # Setup binds for keyboard shortcuts to their appropriate functions
-        self.bind_all("<Control-n>", lambda event: Page(self.notebook, textFont=self.pageFont))
-        self.bind_all("<Control-N>", lambda event: self.tree.dialogue(0))
-        self.bind_all("<Control-o>", lambda event: self.openFileDialogue())
-        self.bind_all("<Control-s>", lambda event: self.notebook.nametowidget(self.notebook.select()).save())
-        self.bind_all("<Control-S>", lambda event: self.notebook.nametowidget(self.notebook.select()).save(True))
-        self.bind_all("<Control-w>", lambda event: self.notebook.nametowidget(self.notebook.select()).close())
-        self.bind_all("<Control-q>", lambda event: self.exit())
-        self.bind_all("<Control-plus>", lambda event: self.fontSize(1))
-        self.bind_all("<Control-minus>", lambda event: self.fontSize(-1))
+        self.bind_all("<Shift_R>", lambda event: self.speechRec.start())
+
+        # Finish setting up the window once it has been shown
+        self.after_idle(self.finishInit)
+
+    def finishInit(self):
+        # Finish Init method used to complete setup once the window is shown.
+        #
+        # Called when the main window's event loop first becomes idle so that
+        # slower setup which is not needed to draw the window does not delay
+        # it from appearing. Checks for a working microphone and sets the
+        # microphone button, statusbar and menu to reflect its status, sets up
+        # binds for keyboard shortcuts and sets the window's icon.
+        #
+        # Accepts no parameters.
+
+        # Set appropriate statusbar and microphone button text/icon depending
+        # on whether the microphone is disabled or if isn't, whether one is
+        # available or not
+        self.killMic(True)
+
+        # Setup a single bind for all control key presses which calls the
+        # function of the keyboard shortcut matching the key pressed
+        self.shortcuts = {
+            "n": self.newPage,
+            "N": partial(self.tree.dialogue, 0),
+            "o": self.openFileDialogue,
+            "s": self.savePage,
+            "S": partial(self.savePage, True),
+            "w": self.closePage,
+            "q": self.exit,
+            "plus": partial(self.fontSize, 1),
+            "minus": partial(self.fontSize, -1)
+        }
+        self.bind_all("<Control-KeyPress>", self.shortcut)
 
         # Set the window's icon
         self.iconbitmap("resources/icon.ico")
 
+    def shortcut(self, event):
+        # Shortcut method used to perform keyboard shortcuts.
+        #
+        # Called on every key press while the control key is held. Looks up
+        # the key pressed in the dictionary of keyboard shortcuts and calls the
+        # matching function if there is one.
+        #
+        # Parameters:
+        #   event: A Tkinter event object holding the key that was pressed.
+
+        function = self.shortcuts.get(event.keysym)
+        if function is not None:
+            function()
+            return "break"
+
+    def newPage(self):
+        # New Page method used to create a new untitled code editor tab.
+        #
+        # Accepts no parameters.
+
+        Page(self.notebook, textFont=self.pageFont)
+
+    def savePage(self, saveAs=False):
+        # Save Page method used to save the current code editor tab.
+        #
+        # Parameters:
+        #   saveAs: Boolean that when true forces the save file dialogue to be
+        #     shown regardless of whether the opened file already has a path.
+
+        self.currentPage.save(saveAs)
+
+    def closePage(self):
+        # Close Page method used to close the current code editor tab.
+        #
+        # Accepts no parameters.
+
+        self.currentPage.close()
+
+    def runPage(self):
+        # Run Page method used to execute the file in the current editor tab.
+        #
+        # Accepts no parameters.
+
+        self.currentPage.run()
+
+    def undoRedo(self, undo):
+        # Undo/redo method used to undo or redo changes in the current tab.
+        #
+        # As any part of the tab may have changed it is highlighted again.
+        #
+        # Parameters:
+        #   undo: Boolean for specifying undo or redo. True for undo, false for
+        #     redo.
+
+        self.currentPage.undoRedo(undo)
+        self.currentPage.syntaxHighlight()
+
+    def selectAll(self):
+        # Select All method used to select all text in the current editor tab.
+        #
+        # Accepts no parameters.
+
+        self.currentPage.text.tag_add("sel", "1.0", "end")
+
+    def textEvent(self, virtualEvent):
+        # Text Event method used to cut, copy or paste in the current tab.
+        #
+        # The tab is highlighted again if its contents may have changed.
+        #
+        # Parameters:
+        #   virtualEvent: A string containing the name of the Tkinter virtual
+        #     event to generate in the current tab's text field, such as
+        #     "<<Copy>>".
+
+        self.currentPage.text.event_generate(virtualEvent)
+        if virtualEvent != "<<Copy>>":
+            self.currentPage.syntaxHighlight()
+
     def killMic(self, override=False):
         # Kill Mic method used to toggle the microphone on or off.
         #
@@ -289,12 +470,11 @@ class App(tk.Tk):
         if not self.micKilled.get():
             # Microphone enabled
             self.micMb.entryconfig(0, state="normal")
-            try:
+            if self.probeMic():
                 # Working microphone found
-                sr.Microphone()
                 self.statusbar.config(text="Waiting Command...")
                 self.micButton.config(image=self.micICO, text="Microphone Ready")
-            except OSError:
+            else:
                 # No working microphone
                 self.statusbar.config(text="Microphone Offline")
                 self.micButton.config(image=self.nomicICO, text="Microphone Offline")
@@ -305,11 +485,106 @@ class App(tk.Tk):
             self.micButton.config(image=self.nomicICO, text="Microphone Disabled")
             self.statusbar.config(text="Microphone Disabled by User")
 
+    def probeMic(self, refresh=False):
+        # Probe Mic method used to check if a working microphone is available.
+        #
+        # Creating a microphone object enumerates every audio device on the
+        # system which is slow, so the result of the first check and the
+        # microphone object it created are stored as attributes and used by
+        # later calls and by voice control instead. The check is only performed
+        # again if a refresh is requested, such as when a microphone has been
+        # connected. Returns the microphone object if a working microphone was
+        # found, otherwise None.
+        #
+        # Parameters:
+        #   refresh: A boolean which when true discards the stored result and
+        #     checks for a microphone again.
+
+        if refresh or self.micAvailable is None:
+            try:
+                self.microphone = sr.Microphone()
+            except OSError:
+                self.microphone = None
+            self.micAvailable = self.microphone is not None
+
+        return self.microphone
+
+    def refreshMic(self):
+        # Refresh Mic method used to check for a newly connected microphone.
+        #
+        # Checks for a working microphone again, ignoring the stored result,
+        # then updates the microphone toolbar button, statusbar and menu to
+        # reflect the new status.
+        #
+        # Accepts no parameters.
+
+        self.probeMic(True)
+        self.killMic(True)
+
+    def tabChanged(self, event=None):
+        # Tab Changed method used to store the currently selected editor tab.
+        #
+        # Called whenever the selected tab in the notebook changes. Looks up
+        # the code editor object of the newly selected tab and stores it as an
+        # attribute which is used by the menu, toolbar and keyboard shortcut
+        # commands. Stores None if no tab is selected.
+        #
+        # Parameters:
+        #   event: A Tkinter event object passed by the notebook tab changed
+        #     event bind (Unused).
+
+        # Ask Tcl directly for the selected tab's widget path, skipping the
+        # Python wrapper of the notebook's select method
+        selected = self.tk.call(self.notebookPath, "select")
+        self.currentPage = self.nametowidget(selected) if selected else None
+
+    def pageOpened(self, event):
+        # Page Opened method used to record a newly created editor tab.
+        #
+        # Called when a code editor tab is added to the notebook. Adds the tab
+        # to the list of open tabs.
+        #
+        # Parameters:
+        #   event: A Tkinter event object whose widget is the opened tab.
+
+        self.pages.append(event.widget)
+
+    def pageSaved(self, event):
+        # Page Saved method used to record the new path of a saved editor tab.
+        #
+        # Called when a code editor tab is saved. Maps the tab's path to it so
+        # that the file is switched to rather than opened again, which is
+        # needed when a new file is saved or a file is saved under a new name.
+        # Any previous path mapped to the tab is removed so that file is opened
+        # in a new tab rather than switching to this one.
+        #
+        # Parameters:
+        #   event: A Tkinter event object whose widget is the saved tab.
+
+        page = event.widget
+        for path in [path for path, other in self.pagesByPath.items() if other is page and path != page.path]:
+            del self.pagesByPath[path]
+        self.pagesByPath[page.path] = page
+
+    def pageClosed(self, event):
+        # Page Closed method used to forget the path of a closed editor tab.
+        #
+        # Called when a code editor tab is closed. Removes the tab from the list
+        # of open tabs and the mapping from the tab's path to it if there is
+        # one.
+        #
+        # Parameters:
+        #   event: A Tkinter event object whose widget is the closed tab.
+
+        self.pages.remove(event.widget)
+        if self.pagesByPath.get(event.widget.path) is event.widget:
+            del self.pagesByPath[event.widget.path]
+
     def openFile(self, path):
         # Open File method used to open a file in a new notebook tab.
         #
-        # Iterates over all tabs in the notebook and if a tab has the same path
-        # as the one provided, switches the focus to it and returns. If no tab
+        # Looks up the tab opened with the same path as the one provided and
+        # if it is still open, switches the focus to it and returns. If no tab
         # is found (file is not already open) then attempts to read the
         # contents of the file at the provided path and creates a new code
         # editor tab with it in. If the first tab is an empty and new, it is
@@ -319,32 +594,42 @@ class App(tk.Tk):
         # Parameters:
         #   path: A string containing the path of the file to open.
 
-        # If one exists, set focus on first tab with the same path as provided
-        # then return
-        for pageName in self.notebook.tabs():
-            if path == self.notebook.nametowidget(pageName).path:
-                self.notebook.select(pageName)
-                return
+        # If one exists, set focus on the tab with the same path as provided
+        # then return. The tab's path is checked as it may have been saved
+        # elsewhere since it was opened
+        page = self.pagesByPath.get(path)
+        if page is not None and page.path == path:
+            self.notebook.select(page)
+            return
+
+        # Get the filename from the path to use as the tab title and in error
+        # messages
+        name = os.path.basename(path) or path
 
         try:
             with open(path, "r") as file:
                 try:
                     # Attempt to create a new code editor tab in the notebook
                     # with the contents read from the file at provided path
-                    Page(self.notebook, file.read(), path.split("/")[-1] if "/" in path else path, path, self.pageFont)
+                    page = Page(self.notebook, file.read(), name, path, self.pageFont)
+                    self.pagesByPath[path] = page
                 except UnicodeDecodeError:
                     # Display messagebox if an unreadable character prevents
                     # the file contents from being read and return
-                    messagebox.showerror("Unreadable File", "The File \"" + (path.split("/")[-1] if "/" in path else path) + "\" contains a character that is unreadable by this software. It cannot be opened.")
+                    messagebox.showerror("Unreadable File", "The File \"" + name + "\" contains a character that is unreadable by this software. It cannot be opened.")
                     return
 
-            # If the first tab in the notebook has an empty contents and no
-            # path (it is new), remove it
-            if self.notebook.nametowidget(self.notebook.tabs()[0]).text.get("1.0", "end") == "\n" and self.notebook.nametowidget(self.notebook.tabs()[0]).path is None:
-                self.notebook.forget(self.notebook.tabs()[0])
+            # If the first tab in the notebook has no path (it is new) and an
+            # empty contents, remove it. The list of open tabs is in the same
+            # order as the notebook and the contents is checked by comparing
+            # the start and end positions rather than reading it
+            first = self.pages[0]
+            if first.path is None and first.text.compare("end-1c", "==", "1.0"):
+                self.notebook.forget(first)
+                self.pages.remove(first)
         except:
             # Display messagebox if an error occurs then stop opening
-            messagebox.showerror("Error Opening Item", "An error occurred when opening the item \"" + path.split("/")[-1] if "/" in path else path + "\". Ensure the file exists and you have permission.")
+            messagebox.showerror("Error Opening Item", "An error occurred when opening the item \"" + name + "\". Ensure the file exists and you have permission.")
 
     def openFileDialogue(self):
         # Open File Dialogue method used to open an 'open file' dialogue.
@@ -355,7 +640,7 @@ class App(tk.Tk):
         #
         # Accepts no parameters.
 
-        path = filedialog.askopenfilename(filetypes=[("Python File", ".py"), ("Text File", ".txt"), ("JSON File", ".json"), ("CSV File", ".csv"), ("All Files", "*")], defaultextension="*.*")
+        path = filedialog.askopenfilename(filetypes=App.fileTypes, defaultextension="*.*")
 
         if path != "":
             self.openFile(path)
@@ -376,6 +661,40 @@ class App(tk.Tk):
             self.pageFont.config(size=newSize)
             self.prefs["font"][1] = newSize
 
+    def writePrefs(self):
+        # Write Prefs method used to save the preferences to the JSON file.
+        #
+        # Compares the preferences dictionary with the preferences last read
+        # from or written to the file and only writes them if they have changed
+        # to avoid needless disk writes. The file is replaced in one step so a
+        # corrupt file is never left behind, unless the directory does not
+        # allow new files in which case the file is written in place.
+        #
+        # Accepts no parameters.
+
+        prefs = json.dumps(self.prefs, sort_keys=True, separators=(",", ":"))
+        if prefs != self.savedPrefs:
+            # Write to a temporary file in the same directory then replace the
+            # preferences file with it, so the file is never left half written
+            # if the program is closed during writing
+            try:
+                fd, tempPath = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath("prefs.json")), prefix=".prefs.", suffix=".tmp")
+            except OSError:
+                # If a file cannot be created in the directory, such as when
+                # only the preferences file itself is writable, write to the
+                # preferences file directly instead
+                with open("prefs.json", "w") as prefsFile:
+                    prefsFile.write(prefs)
+            else:
+                try:
+                    with os.fdopen(fd, "w") as prefsFile:
+                        prefsFile.write(prefs)
+                    os.replace(tempPath, "prefs.json")
+                except OSError:
+                    os.remove(tempPath)
+                    raise
+            self.savedPrefs = prefs
+
     def aboutWindow(self):
         # About Window method used to show an information window.
         #
@@ -385,12 +704,16 @@ class App(tk.Tk):
         #
         # Accepts no parameters.
 
+        # Get the size of the screen the first time the window is opened
+        if self.screenSize is None:
+            self.screenSize = (self.winfo_screenwidth(), self.winfo_screenheight())
+
         dialogue = tk.Toplevel(self)
 
         # Set window options
         dialogue.title("About")
         dialogue.resizable(False, False)
-        dialogue.geometry("800x500+" + str(int((self.winfo_screenwidth() - 800) / 2)) + "+" + str(int((self.winfo_screenheight() - 500) / 2)))
+        dialogue.geometry("800x500+%d+%d" % ((self.screenSize[0] - 800) // 2, (self.screenSize[1] - 500) // 2))
         dialogue.overrideredirect(True)
         dialogue.grab_set()
 
@@ -406,16 +729,25 @@ class App(tk.Tk):
     def exit(self):
         # Exit method used to close the main window safely.
         #
-        # Iterates over all currently open code editor notebook tabs and calls
+        # Iterates over a copy of the list of open code editor tabs and calls
         # their close method. If any are unsaved new the method will prompt the
-        # user to save them. Once all are successfully closed the main window
-        # is destroyed and the program quit. Exiting will be halted if the user
-        # chooses to press 'Cancel' when asked to save a file.
+        # user to save them. Once all are successfully closed any changed
+        # preferences are written to file (with a warning shown if this fails)
+        # and the main window is destroyed and the program quit. Exiting will
+        # be halted if the user chooses to press 'Cancel' when asked to save a
+        # file.
         #
         # Accepts no parameters.
 
-        for pageName in self.notebook.tabs():
-            if self.notebook.nametowidget(pageName).close():
+        for page in list(self.pages):
+            if page.close():
                 # Return from method if saving is cancelled
                 return
+
+        # Save any changed preferences such as the font size then close, even
+        # if the preferences could not be written
+        try:
+            self.writePrefs()
+        except OSError:
+            messagebox.showwarning("Preferences not saved", "Your preferences could not be saved. Please check you have permission to write to the program's directory.")
         self.destroy()
@@ -11,15 +11,27 @@
 #   tkinter: GUI library used to create the widget by inheriting from
 #     and using other widgets which are part of the library. Also for
 #     displaying on screen dialogues like save file and message boxes.
-#   os: Allows command line access used to execute the python program
-#     currently being edited.
+#   os: Used to find the folder containing the python program being run
+#     and to replace files when saving.
+#   tempfile: Creates the temporary file the contents are written to
+#     before it replaces the file being saved.
+#   shutil: Copies the permissions of the file being saved to the
+#     temporary file which replaces it.
+#   subprocess: Starts the python program currently being edited in a new
+#     console window.
 #   json: Handles the reading of the JSON file containing the keywords
 #     and builtin functions to be syntax highlighted into a dictionary.
+#   re: Regular expression library used to find the keywords, builtin
+#     functions, strings and comments to be syntax highlighted.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
+import tempfile
+import shutil
+import subprocess
 import json
+import re
 
 
 class Page(tk.Frame):
@@ -34,23 +46,53 @@ class Page(tk.Frame):
     # to match the python syntax using the syntaxHighlight method. Includes
     # other file and tab related methods such as save and close. The path
     # and contents of the open file at the last save (if applicable) can be
-    # obtained from the object as attributes.
+    # obtained from the object as attributes. Generates the virtual events
+    # <<PageOpened>>, <<PageSaved>> and <<PageClosed>> when opened, saved or
+    # closed.
 
-    # List of characters that cannot be used in identifiers so will not
+    # Set of characters that cannot be used in identifiers so will not
     # prevent syntax highlighting
-    illegals = ["`", "¬", "¦", "!", "\"", "%", "^", "&", "*", "(", ")", "-", " ", "+", "=", "[", "]", "{", "}", "'", "@", ":", ";", "#", "~", "/", "?", ",", "<", ".", ">", "\\", "|"]
+    illegals = frozenset("`¬¦!\"%^&*()- +=[]{}'@:;#~/?,<.>\\|")
 
     # Read lists of keywords and built in functions to highlight from file
-    with open("resources/syntax.json", "r") as syntaxFile:
+    with open("resources/syntax.json", "rb") as syntaxFile:
         syntax = json.loads(syntaxFile.read())
 
+    # Lines longer than this number of characters are not syntax highlighted,
+    # so a single very long line (such as minified code or data) cannot stall
+    # the editor
+    MAX_LINE_HIGHLIGHT = 16384
+
+    # Number of characters at the start of the previous line which are checked
+    # for indentation when enter is pressed
+    MAX_INDENT_SCAN = 256
+
+    # Map every keyword and built in function identifier to the name of its
+    # color tag so all of them can be recognised with one dictionary lookup.
+    # Identifiers which are both keywords and built in functions are colored
+    # as built in
+    wordTags = dict.fromkeys(syntax["keywords"], "kw")
+    wordTags.update(dict.fromkeys(syntax["builtins"], "bi"))
+
+    # Build a single regular expression which matches comments (from a hash
+    # sign to the end of the line), strings (up to a matching quotation mark
+    # or the end of the line) and whole identifiers (runs of characters which
+    # are not illegal). Comments and strings are captured in a group named
+    # after their color tag, identifiers are looked up in wordTags
+    pattern = re.compile(
+        "(?P<comment>#.*)"
+        "|(?P<str>\"[^\"]*\"?|'[^']*'?)"
+        "|(?P<word>[^" + "".join(map(re.escape, sorted(illegals))) + "]+)"
+    )
+
     def __init__(self, notebook, cont=None, title="Untitled", path=None, textFont=("Courier New", 12)):
         # Constructor method of code editor widget.
         #
         # Sets up public attributes (path, text widget and saved contents) with
         # values from parameters. Also creates the UI elements which form the
         # widget (scrollbars and text). Automatically performs initial syntax
-        # highlighting, adds tab to notebook and selects it.
+        # highlighting if there are initial contents, adds tab to notebook and
+        # selects it.
         #
         # Parameters:
         #   notebook: The tkinter Notebook object which the tab should be added
@@ -71,13 +113,20 @@ class Page(tk.Frame):
         self.textFont = textFont
         self.path = path
 
+        # Whether there are lines waiting to be highlighted again and the
+        # identifier of the delayed highlighting job if one is scheduled
+        self.dirty = False
+        self.highlightJob = None
+
         # Define text field element and its scrollbars
         self.text = tk.Text(self, font=textFont, wrap="none", undo=1)
-        ysb = ttk.Scrollbar(self, command=self.text.yview)
+        self.ysb = ttk.Scrollbar(self, command=self.text.yview)
         xsb = ttk.Scrollbar(self, orient="horizontal", command=self.text.xview)
 
-        # Link scrollbars to text field
-        self.text["yscrollcommand"] = ysb.set
+        # Link scrollbars to text field. The vertical scrollbar is updated
+        # through the y scroll method so lines scrolled into view are
+        # highlighted
+        self.text["yscrollcommand"] = self.yScroll
         self.text["xscrollcommand"] = xsb.set
 
         # Create color tags belonging to the text field for syntax highlighting
@@ -99,17 +148,25 @@ class Page(tk.Frame):
         else:
             self.saved = ""
 
-        # Add the tab to the notebook object specified
+        # Add the tab to the notebook object specified and notify the rest of
+        # the program that the tab has been opened
         self.notebook.add(self, text=title)
+        self.event_generate("<<PageOpened>>")
 
         # Add and position the text field and scrollbars on the tab
         xsb.pack(side="bottom", fill="x")
-        ysb.pack(side="right", fill="y")
+        self.ysb.pack(side="right", fill="y")
         self.text.pack(fill="both", expand=1, side="left")
 
-        # Select the tab in the notebook and perform initial syntax highlight
+        # Setup bind for key releases in the text field to schedule syntax
+        # highlighting of the lines that changed
+        self.text.bind("<KeyRelease>", self.scheduleHighlight)
+
+        # Select the tab in the notebook and perform initial syntax highlight,
+        # which is skipped for a new empty file as there is nothing to color
         self.notebook.select(self)
-        self.syntaxHighlight()
+        if cont:
+            self.syntaxHighlight()
 
     def save(self, saveAs=False):
         # Save method used to write/update the contents of the current file.
@@ -120,36 +177,81 @@ class Page(tk.Frame):
         # written to the associated path (or that provided by the Save As
         # dialogue if applicable) and stored as the last save contents. Should
         # an error occur, a messagebox is shown, the path removed and the
-        # process repeated again with the dialogue.
+        # process repeated again with the dialogue. The file is replaced in one
+        # step so a partly written file is never left behind, unless replacing
+        # it would lose its links or owner or the directory does not allow new
+        # files, in which case it is written in place.
         #
         # Parameters:
         #   saveAs: Boolean that when true forces the save file dialogue to be
         #     shown regardless of whether the opened file already has a path.
 
-        if self.path is None or saveAs:
-            # Create Save As dialogue and store path if tab has no associated
-            # path or if saveAs parameter is true
-            path = filedialog.asksaveasfilename(filetypes=[("Python File", ".py"), ("Text File", ".txt"), ("JSON File", ".json"), ("CSV File", ".csv"), ("All Files", "*")], defaultextension="*.*")
-            if path == "":
-                # Return from function if no filename was provided
-                return True
-            else:
-                # Update path associated with the tab and set its title to the
-                # new filename
-                self.path = path
-                self.notebook.tab(self, text=path.split("/")[-1] if "/" in path else path)
-
-        try:
-            # Attempt to write text field contents to path and update last save
-            # contents variable
-            with open(self.path, "w") as file:
-                file.write(self.text.get("1.0", "end-1c"))
-                self.saved = self.text.get("1.0", "end-1c")
-        except:
-            # Display messagebox if an error occurs, remove path and redo save
-            messagebox.showerror("An error occurred while saving the file", "Could not save file. Please check you have permission and the path exists.")
-            self.path = None
-            self.save()
+        # Repeat until the file is saved or the dialogue is cancelled
+        while True:
+            if self.path is None or saveAs:
+                # Create Save As dialogue and store path if tab has no associated
+                # path or if saveAs parameter is true
+                path = filedialog.asksaveasfilename(filetypes=[("Python File", ".py"), ("Text File", ".txt"), ("JSON File", ".json"), ("CSV File", ".csv"), ("All Files", "*")], defaultextension="*.*")
+                if path == "":
+                    # Return from function if no filename was provided
+                    return True
+                else:
+                    # Update path associated with the tab and set its title to
+                    # the new filename
+                    self.path = path
+                    self.notebook.tab(self, text=path.split("/")[-1] if "/" in path else path)
+
+            try:
+                # Attempt to write text field contents to path and update last
+                # save contents variable, fetching the contents from the text
+                # field once. The contents are written to a temporary file in
+                # the same directory which then replaces the file, so the file
+                # is never left half written if writing fails part way through.
+                # The temporary file is given the permissions of the file it
+                # replaces if there is one. Symbolic links are followed so the
+                # file they point to is replaced rather than the link itself
+                contents = self.text.get("1.0", "end-1c")
+                target = os.path.realpath(self.path)
+
+                # Write in place instead if replacing the file would remove
+                # its other hard links or change its owner
+                inPlace = False
+                if os.path.exists(target):
+                    st = os.stat(target)
+                    inPlace = st.st_nlink > 1 or (hasattr(os, "getuid") and st.st_uid != os.getuid())
+
+                # Also write in place if a temporary file cannot be created in
+                # the directory, such as when only the file itself is writable
+                if not inPlace:
+                    try:
+                        fd, tempPath = tempfile.mkstemp(dir=os.path.dirname(target), prefix="." + os.path.basename(target) + ".", suffix=".tmp")
+                    except OSError:
+                        inPlace = True
+
+                if inPlace:
+                    with open(target, "w") as file:
+                        file.write(contents)
+                else:
+                    try:
+                        with os.fdopen(fd, "w") as file:
+                            file.write(contents)
+                        if os.path.exists(target):
+                            shutil.copymode(target, tempPath)
+                        os.replace(tempPath, target)
+                    except (OSError, UnicodeEncodeError):
+                        os.remove(tempPath)
+                        raise
+                self.saved = contents
+            except (OSError, UnicodeEncodeError):
+                # Display messagebox if an error occurs and remove path so the
+                # save is tried again with the dialogue
+                messagebox.showerror("An error occurred while saving the file", "Could not save file. Please check you have permission and the path exists.")
+                self.path = None
+                continue
+
+            # Notify the rest of the program that the tab has been saved
+            self.event_generate("<<PageSaved>>")
+            return
 
     def close(self):
         # Close method used to close and destroy the tab.
@@ -172,8 +274,10 @@ class Page(tk.Frame):
             elif res is None:
                 return True
 
-        # Remove the tab from the notebook
+        # Remove the tab from the notebook and notify the rest of the program
+        # that the tab has been closed
         self.notebook.forget(self)
+        self.event_generate("<<PageClosed>>")
 
         # Insert a new tab with an new untitled file if the notebook is empty
         if len(self.notebook.tabs()) == 0:
@@ -200,8 +304,12 @@ class Page(tk.Frame):
             elif not res:
                 return
 
-        # Run file at the tab's path with python interpreter using command line
-        os.system("start cmd /K py \"" + self.path + "\"")
+        # Run file at the tab's path with python interpreter in a new console
+        # window which stays open after the program finishes. The console is
+        # created directly, with the path passed as a separate argument, rather
+        # than by having another shell parse a start command string. The
+        # program is run from the folder containing the file
+        subprocess.Popen(["cmd", "/K", "py", self.path], cwd=os.path.dirname(self.path) or None, creationflags=subprocess.CREATE_NEW_CONSOLE)
 
     def undoRedo(self, undo):
         # Undo/redo method used to undo or redo changes made in the text field.
@@ -223,210 +331,207 @@ class Page(tk.Frame):
         except tk.TclError:
             pass
 
-    def syntaxHighlight(self, event=None):
-        # Syntax highlight method used to color code and automatically indent.
+    def markDirty(self, start="insert linestart", end="insert lineend"):
+        # Mark dirty method used to record lines which need highlighting again.
         #
-        # If a key press event is passed to this method and the key pressed is
-        # enter, inserts the same amount of whitespace to automatically indent
-        # and adds a further four spaces if the previous line ends in a colon.
-        # Removes all previous syntax highlighting color tags then iterates
-        # over every keyword and builtin function identifier to apply the
-        # appropriate color tag to each match in the text field. Also searches
-        # for string quotes and comment hash signs then colors the text for the
-        # remainder of the line or up to another quotation mark on the same
-        # line.
+        # Extends the region of the text field waiting to be syntax highlighted
+        # by the highlight dirty method to include the lines between the start
+        # and end positions provided. The region is stored using a pair of
+        # marks so it stays correct as text is inserted or deleted.
         #
         # Parameters:
-        #   event: A Tkinter event object holding the key that triggered it or
-        #     None if the method should be called independently of an event.
+        #   start: A string containing a Tkinter text index within the first
+        #     line to include. Defaults to the line the cursor is on.
+        #   end: A string containing a Tkinter text index within the last line
+        #     to include. Defaults to the line the cursor is on.
 
         t = self.text
 
-        if event is not None and event.keysym == "Return":
-            # If the method was called with an event and the triggering key was
-            # enter, insert the same number of indents as the previous line
-            prevln = t.get(t.index("insert" + "-1c linestart"), t.index("insert" + "-1c lineend"))
-            t.insert("insert", " " * 4 * ((len(prevln) - len(prevln.lstrip())) // 4))
-
-            # Insert an extra 4 spaces if the previous line ends in a colon (:)
-            if t.get(t.index("insert" + "-1l lineend -1c")) == ":":
-                t.insert("insert", "    ")
-
-        # Remove all color tags from the text field
-        t.tag_remove("kw", "1.0", "end")
-        t.tag_remove("bi", "1.0", "end")
-        t.tag_remove("str", "1.0", "end")
-        t.tag_remove("comment", "1.0", "end")
-
-        # KEYWORD HIGHLIGHTING
-
-        # Iterate over all python keywords
-        for kw in Page.syntax["keywords"]:
-            # Create variable for storing match length and create text pointers
-            # (marks) with their initial position at the start of text field
-            length = tk.IntVar()
-            t.mark_set("a", "1.0")
-            t.mark_set("b", "1.0")
-
-            # Repeat until no more of matches of the current keyword are found
-            while True:
-                # Search for keyword in text field and break if none found
-                index = t.search(kw, "b", "end", count=length)
-
-                if index == "":
-                    break
-
-                line = t.get(index + " linestart", index + "lineend")
-
-                # Move pointers/marks around keyword
-                t.mark_set("a", index)
-                t.mark_set("b", "%s+%sc" % (index, length.get()))
-
-                # Add tag around keyword if below conditions are satisfied
-                if (
-                    # Line contains only the keyword
-                    (index.split(".")[1] == "0" and len(line) == int(index.split(".")[1]) + length.get()) or
-                    # Keyword at start of line and ends in illegal
-                    (index.split(".")[1] == "0" and line[int(index.split(".")[1]) + length.get()] in Page.illegals) or
-                    # Keyword at end of line and starts with illegal
-                    (len(line) == int(index.split(".")[1]) + length.get() and line[int(index.split(".")[1]) - 1] in Page.illegals) or
-                    # Keyword in midst of line but starts and ends with illegal
-                    (
-                        (index.split(".")[1] != "0" and len(line) > int(index.split(".")[1]) + length.get()) and
-                        (line[int(index.split(".")[1]) - 1] in Page.illegals and line[int(index.split(".")[1]) + length.get()] in Page.illegals)
-                    )
-                ):
-                    t.tag_add("kw", "a", "b")
-
-        # BUILT IN FUNCTION HIGHLIGHTING
-
-        # Iterate over all python built in function identifiers
-        for bi in Page.syntax["builtins"]:
-            # Create variable for storing match length and create text pointers
-            # (marks) with their initial position at the start of text field
-            length = tk.IntVar()
-            t.mark_set("a", "1.0")
-            t.mark_set("b", "1.0")
-
-            # Repeat until no more of matches of the current function are found
-            while True:
-                # Search for function in text field and break if none found
-                index = t.search(bi, "b", "end", count=length)
-
-                if index == "":
-                    break
-
-                line = t.get(index + " linestart", index + "lineend")
-
-                # Move pointers/marks around function identifier
-                t.mark_set("a", index)
-                t.mark_set("b", "%s+%sc" % (index, length.get()))
-
-                # Add tag around identifier if below conditions are satisfied
-                if (
-                    # Line contains only the function identifier
-                    (index.split(".")[1] == "0" and len(line) == int(index.split(".")[1]) + length.get()) or
-                    # Function identifier at start of line and ends in illegal
-                    (index.split(".")[1] == "0" and line[int(index.split(".")[1]) + length.get()] in Page.illegals) or
-                    # Function identifier at end of line and starts with
-                    # illegal
-                    (len(line) == int(index.split(".")[1]) + length.get() and line[int(index.split(".")[1]) - 1] in Page.illegals) or
-                    # Function identifier in midst of line but starts and ends
-                    # with illegal
-                    (
-                        (index.split(".")[1] != "0" and len(line) > int(index.split(".")[1]) + length.get()) and
-                        (line[int(index.split(".")[1]) - 1] in Page.illegals and line[int(index.split(".")[1]) + length.get()] in Page.illegals)
-                    )
-                ):
-                    t.tag_add("bi", "a", "b")
-
-        # STRING HIGHLIGHTING (DOUBLE QUOTES)
-
-        # Create text pointers (marks) with their initial position at the start
-        # of text field
-        t.mark_set("a", "1.0")
-        t.mark_set("b", "1.0")
-
-        # Repeat until no more of matches of double quotes are found
-        while True:
-            # Search for double quotes in text field and break if none found
-            index = t.search("\"", "b", "end")
+        if not self.dirty:
+            t.mark_set("dirtyStart", start)
+            t.mark_set("dirtyEnd", end)
+            self.dirty = True
+        else:
+            if t.compare(start, "<", "dirtyStart"):
+                t.mark_set("dirtyStart", start)
+            if t.compare(end, ">", "dirtyEnd"):
+                t.mark_set("dirtyEnd", end)
 
-            if index == "":
-                break
-            else:
-                # If double quotes are found search again from their position
-                # to the end of the same line
-                t.mark_set("a", index)
-                t.mark_set("b", index + " lineend")
-
-                index = t.search("\"", "a+1c", "b")
-
-                # If no more double quotes are found on the same line highlight
-                # the remainder of the line otherwise highlight between the
-                # pair of double quotes
-                if index == "":
-                    t.tag_add("str", "a", "a lineend")
-                else:
-                    t.mark_set("b", index)
-                    t.tag_add("str", "a", "b+1c")
-                    t.mark_set("b", index + "+1c")
+    def scheduleHighlight(self, event):
+        # Schedule Highlight method used to syntax highlight after key presses.
+        #
+        # Called on every key release in the text field. Rather than syntax
+        # highlighting straight away, the line the cursor is on (or the whole
+        # text field if the control key is held, as shortcuts like paste and
+        # undo can change any line) is marked as needing highlighting and
+        # highlighting is delayed by a short time. Any highlighting still
+        # waiting from a previous key release is cancelled, so that when typing
+        # quickly the changed lines are only highlighted once the burst of key
+        # presses has finished. The enter key is handled straight away as it
+        # also automatically indents the new line.
+        #
+        # Parameters:
+        #   event: A Tkinter event object holding the key that was released.
 
-        # STRING HIGHLIGHTING (SINGLE QUOTES)
+        if event.keysym == "Return":
+            self.syntaxHighlight(event, "insert -1l linestart", "insert lineend")
+            return
 
-        # Create text pointers (marks) with their initial position at the start
-        # of text field
-        t.mark_set("a", "1.0")
-        t.mark_set("b", "1.0")
+        if event.state & 4 or event.keysym == "Insert":
+            self.text.tag_remove("highlighted", "1.0", "end")
+        else:
+            self.markDirty()
 
-        # Repeat until no more of matches of single quotes are found
-        while True:
-            # Search for single quotes in text field and break if none found
-            index = t.search("'", "b", "end")
+        if self.highlightJob is not None:
+            self.after_cancel(self.highlightJob)
+        self.highlightJob = self.after(40, self.highlightDirty)
 
-            if index == "":
-                break
-            else:
-                # If a single quote is found search again from its position to
-                # the end of the same line
-                t.mark_set("a", index)
-                t.mark_set("b", index + " lineend")
+    def highlightDirty(self):
+        # Highlight dirty method used to highlight lines marked as changed.
+        #
+        # Syntax highlights only the lines recorded by the mark dirty method,
+        # if there are any, then clears the record. Any visible lines which are
+        # no longer highlighted are then highlighted too. Also called once the
+        # delay set by the schedule highlight method has passed.
+        #
+        # Accepts no parameters.
 
-                index = t.search("'", "a+1c", "b")
+        self.highlightJob = None
+        if self.dirty:
+            self.dirty = False
+            self.syntaxHighlight(start="dirtyStart linestart", end="dirtyEnd lineend")
+        self.highlightVisible()
 
-                # If no more single quotes are found on the same line highlight
-                # the remainder of the line otherwise highlight between the
-                # pair of single quotes
-                if index == "":
-                    t.tag_add("str", "a", "a lineend")
+    def highlightVisible(self):
+        # Highlight visible method used to highlight lines scrolled into view.
+        #
+        # Lines which have been highlighted are marked with the highlighted tag
+        # so only the lines currently shown in the text field which do not have
+        # the tag are highlighted. This means lines are only highlighted when
+        # they are first seen rather than all at once when a file is opened.
+        #
+        # Accepts no parameters.
 
-                else:
-                    t.mark_set("b", index)
-                    t.tag_add("str", "a", "b+1c")
-                    t.mark_set("b", index + "+1c")
+        t = self.text
+        pos = t.index("@0,0 linestart")
+        end = t.index("@0,%d lineend" % t.winfo_height())
+
+        # Step through the lines in view, skipping over ranges which have
+        # already been highlighted and highlighting the gaps between them
+        while t.compare(pos, "<", end):
+            if "highlighted" in t.tag_names(pos):
+                pos = t.tag_prevrange("highlighted", pos + " +1c")[1]
+            else:
+                nextRange = t.tag_nextrange("highlighted", pos, end)
+                gapEnd = t.index(nextRange[0] + " -1c lineend") if nextRange else end
+                self.syntaxHighlight(start=pos + " linestart", end=gapEnd)
+                pos = t.index(gapEnd + " +1c")
 
-        # COMMENT HIGHLIGHTING
+    def yScroll(self, first, last):
+        # Y scroll method used to update the vertical scrollbar.
+        #
+        # Called by the text field whenever the part of it in view changes,
+        # such as when scrolled or resized. Updates the scrollbar position and
+        # highlights any lines which have come into view.
+        #
+        # Parameters:
+        #   first: A string holding the fraction of the text above the view.
+        #   last: A string holding the fraction of the text above the bottom
+        #     of the view.
 
-        # Create text pointers (marks) with their initial position at the start
-        # of text field
-        t.mark_set("a", "1.0")
-        t.mark_set("b", "1.0")
+        self.ysb.set(first, last)
+        self.highlightVisible()
 
-        # Repeat until no more of matches of hash signs are found
-        while True:
-            # Search for hash signs in text field and break if none found
-            index = t.search("#", "b", "end")
-
-            if index == "":
-                break
-
-            # Highlight the entire line from the hash symbol if there is an
-            # even number of double/single quotes (or none) before it implying
-            # the hash symbol is not part of a string and is in fact a comment
-            if t.get(index + " linestart", index).count("\"") % 2 == 0 and t.get(index + " linestart", index).count("'") % 2 == 0:
-                t.mark_set("a", index)
-                t.mark_set("b", index + " lineend")
-                t.tag_remove("str", "a", "b")
-                t.tag_add("comment", "a", "b")
-            else:
-                t.mark_set("b", index + "+1c")
+    def syntaxHighlight(self, event=None, start=None, end=None):
+        # Syntax highlight method used to color code and automatically indent.
+        #
+        # If a key press event is passed to this method and the key pressed is
+        # enter, inserts the same amount of whitespace to automatically indent
+        # and adds a further four spaces if the previous line ends in a colon.
+        # Removes all previous syntax highlighting color tags between the start
+        # and end positions then searches each line in that part of the text
+        # field for keywords, builtin function identifiers, strings and
+        # comments using a single regular expression, applying the appropriate
+        # color tag to each match. Strings are colored up to another quotation
+        # mark on the same line and comments to the end of the line. As strings
+        # and comments never continue onto another line, only the lines which
+        # have changed need to be highlighted again after an edit. If no region
+        # is given the whole text field is treated as changed, but only the
+        # lines in view are highlighted straight away and the rest are
+        # highlighted as they are scrolled into view.
+        #
+        # Parameters:
+        #   event: A Tkinter event object holding the key that triggered it or
+        #     None if the method should be called independently of an event.
+        #   start: A string containing a Tkinter text index at the start of the
+        #     first line to highlight, or None to highlight the whole text field.
+        #   end: A string containing a Tkinter text index at the end of the last
+        #     line to highlight, or None to highlight the whole text field.
+
+        t = self.text
+
+        if event is not None and event.keysym == "Return":
+            # If the method was called with an event and the triggering key was
+            # enter, insert the same number of indents as the previous line plus
+            # an extra one if the previous line ends in a colon (:). Only the
+            # start of the previous line is fetched to find its indentation and
+            # only its last character to check for a colon, so long lines are
+            # not copied out of the text field
+            lead = t.get("insert -1c linestart", "insert -1c linestart +%dc" % Page.MAX_INDENT_SCAN).split("\n", 1)[0]
+            indent = 4 * ((len(lead) - len(lead.lstrip())) // 4)
+            if t.get("insert -2c") == ":":
+                indent += 4
+            t.insert("insert", " " * indent)
+
+        # If no region was given mark every line as not highlighted and only
+        # highlight the lines in view
+        if start is None or end is None:
+            t.tag_remove("highlighted", "1.0", "end")
+            self.highlightVisible()
+            return
+
+        # Convert the start and end of the region to highlight to fixed
+        # positions
+        start = t.index(start)
+        end = t.index(end)
+
+        # Remove all color tags from the region
+        t.tag_remove("kw", start, end)
+        t.tag_remove("bi", start, end)
+        t.tag_remove("str", start, end)
+        t.tag_remove("comment", start, end)
+
+        # Iterate over each line of the region, using the regular expression
+        # to find every identifier, string and comment in a single pass. Strings
+        # and comments get the color tag named after the group which matched,
+        # identifiers get the tag from wordTags if they are a keyword or builtin.
+        # Lines longer than the maximum are skipped. The positions of each match
+        # are collected for its tag so every tag can be applied to all of its
+        # ranges with one call to the text field. The lookups used for every
+        # match are bound to local names beforehand as the inner loop runs once
+        # per token
+        ranges = {"kw": [], "bi": [], "str": [], "comment": []}
+        getTag = Page.wordTags.get
+        finditer = Page.pattern.finditer
+        maxLength = Page.MAX_LINE_HIGHLIGHT
+        lineNum = int(start.split(".")[0])
+        for line in t.get(start, end).split("\n"):
+            if len(line) > maxLength:
+                lineNum += 1
+                continue
+            for match in finditer(line):
+                tag = match.lastgroup
+                if tag == "word":
+                    tag = getTag(match.group())
+                    if tag is None:
+                        continue
+                matchStart, matchEnd = match.span()
+                ranges[tag] += ("%d.%d" % (lineNum, matchStart), "%d.%d" % (lineNum, matchEnd))
+            lineNum += 1
+
+        for tag, tagRanges in ranges.items():
+            if tagRanges:
+                t.tag_add(tag, *tagRanges)
+
+        # Mark the region, including its final newline, as highlighted
+        t.tag_add("highlighted", start, end + " +1c")
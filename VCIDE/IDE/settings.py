@@ -10,13 +10,10 @@
 #     and display warning message boxes.
 #   os: Provides access to the filesystem so the directory tree path
 #     entered can be validated.
-#   json: Handles the formatting and writing of the JSON file which the
-#     settings are stored in.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
-import json
 
 
 class Settings(tk.Toplevel):
@@ -56,9 +53,10 @@ class Settings(tk.Toplevel):
         sizeLabel = tk.Label(formatPrefFrame, text="Size:")
         self.sizeBox = ttk.Combobox(formatPrefFrame, values=["2", "4", "6", "8", "10", "12", "14", "20", "24", "30", "40", "50", "60", "72"], state="readonly")
         self.sizeBox.current(self.root.prefs["sizeNum"])
-        exampleLabel = tk.Label(formatPrefFrame, text="Example", font=self.root.prefs["font"])
-        self.fontBox.bind("<<ComboboxSelected>>", lambda e: exampleLabel.config(font=(self.fontBox.get(), int(self.sizeBox.get()))))
-        self.sizeBox.bind("<<ComboboxSelected>>", lambda e: exampleLabel.config(font=(self.fontBox.get(), int(self.sizeBox.get()))))
+        self.exampleLabel = tk.Label(formatPrefFrame, text="Example", font=self.root.prefs["font"])
+        self.lastFont = tuple(self.root.prefs["font"])
+        self.fontBox.bind("<<ComboboxSelected>>", self.updatePreview)
+        self.sizeBox.bind("<<ComboboxSelected>>", self.updatePreview)
 
         # Define UI elements related to microphone settings (enable / disable)
         micPrefFrame = tk.LabelFrame(self, text="Microphone:", padx=5, pady=5)
@@ -85,7 +83,7 @@ class Settings(tk.Toplevel):
         self.fontBox.grid(row=0, column=1, sticky="w")
         sizeLabel.grid(row=1, column=0, pady=10, sticky="w")
         self.sizeBox.grid(row=1, column=1, pady=10, sticky="w")
-        exampleLabel.grid(row=2, column=0, columnspan=10)
+        self.exampleLabel.grid(row=2, column=0, columnspan=10)
 
         # Add and position microphone settings elements on the window
         micPrefFrame.pack(padx=10, pady=10, fill="x")
@@ -105,6 +103,23 @@ class Settings(tk.Toplevel):
         applyButton.pack(side="right", padx=(0, 20), pady=(0, 10))
         cancelButton.pack(side="right", padx=(0, 10), pady=(0, 10))
 
+    def updatePreview(self, event):
+        # Update preview method used to show the selected font on the example.
+        #
+        # Called when a font or size is selected. Changes the font of the
+        # example label to the selected font and size, unless it is already
+        # displayed in that font so Tkinter does not have to load it again.
+        #
+        # Parameters:
+        #   event: A Tkinter event object from the combobox that was changed.
+
+        font = (self.fontBox.get(), int(self.sizeBox.get()))
+        if font == self.lastFont:
+            return
+
+        self.lastFont = font
+        self.exampleLabel.config(font=font)
+
     def write(self):
         # Save settings method used to update and write preferences to file.
         #
@@ -114,37 +129,36 @@ class Settings(tk.Toplevel):
         #
         # Accepts no parameters.
 
-        # Check if the entered default directory tree path is valid and if not
-        # display an error then return
-        if not os.path.isdir(self.dirEntry.get()):
-            messagebox.showwarning("Directory does not exist", "You have provided the path of a directory that does not exist. Please provide a valid directory path.")
-            return
-
-        # Attempt to create a directory listing for the entered default
-        # directory tree path and display a message box then return if an
+        # Attempt to open a directory listing for the entered default directory
+        # tree path, which checks both that it exists and that it can be
+        # accessed, and display the matching message box then return if an
         # exception is thrown
+        path = self.dirEntry.get()
         try:
-            os.listdir(self.dirEntry.get())
-        except:
+            with os.scandir(path):
+                pass
+        except (FileNotFoundError, NotADirectoryError):
+            messagebox.showwarning("Directory does not exist", "You have provided the path of a directory that does not exist. Please provide a valid directory path.")
+            return
+        except OSError:
             messagebox.showwarning("Directory is inaccessible", "You have provided the path of a directory that is not accessible. Please ensure you have permission.")
             return
 
         # Change the root node in the main window's directory tree
-        self.root.tree.changeDrive(self.dirEntry.get())
+        self.root.tree.changeDrive(path)
 
         # Update the local settings stored in the prefs dictionary
         self.root.prefs["fontNum"] = self.fontBox.current()
         self.root.prefs["sizeNum"] = self.sizeBox.current()
         self.root.prefs["font"] = [self.fontBox.get(), int(self.sizeBox.get())]
         self.root.prefs["micKilled"] = self.root.micKilled.get()
-        self.root.prefs["treePath"] = os.path.abspath(self.dirEntry.get()) + "/"
+        self.root.prefs["treePath"] = os.path.abspath(path) + "/"
         self.root.prefs["treeHidden"] = self.root.treeHidden.get()
 
         self.root.pageFont.config(family=self.root.prefs["font"][0], size=self.root.prefs["font"][1])
 
-        # Write the new settings to the preferences JSON file
-        with open("prefs.json", "w") as prefsFile:
-            json.dump(self.root.prefs, prefsFile)
+        # Write the new settings to the preferences JSON file if changed
+        self.root.writePrefs()
 
         # Close the settings window and return the focus to the main window
         self.destroy()
@@ -13,181 +13,370 @@
 #     audio files such as the mic listening sound.
 #   threading: Adds multithreading support so speech recognition can
 #     run in its own thread to prevent the software from hanging.
+#   queue: Passes requests to start voice control to the thread.
 #   speech_recognition: Library that uses the Google API to convert
 #     microphone input to a string which can be processed.
+#   re: Regular expression library used to replace spoken punctuation
+#     with the symbols it represents.
 
 from IDE.page import Page
 from tkinter import messagebox
 from playsound import playsound
 from threading import Thread
+from queue import Queue, Full
 import speech_recognition as sr
+import re
 
 
 class Speech:
     # Voice control class which does not inherit from any class.
     #
     # The main window instantiates an object of this class upon
-    # construction. The object stores a thread which runs the voice control
-    # method concurrently with the main window and can be used to tell if
-    # the software is undergoing voice control at any time. Can interpret
-    # voice commands to interact with the code editor as it is a attribute
-    # of the main window.
+    # construction. The object stores a worker thread which runs the voice
+    # control method concurrently with the main window whenever it is asked
+    # to, and whether it is running which can be used to tell if the
+    # software is undergoing voice control at any time. Can interpret voice
+    # commands to interact with the code editor as it is a attribute of the
+    # main window.
+
+    # Spoken punctuation and the symbols they are replaced with, along with a
+    # regular expression matching any of them so they can all be replaced in
+    # a single pass over the transcript
+    punctuation = {"open bracket": "(", "close bracket": ")", "colon": ":", "comma": ","}
+    punctuationPattern = re.compile("|".join(map(re.escape, punctuation)))
+
+    # Sets of words which can be used to ask for a new tab, to close a tab or
+    # to run the program
+    newWords = frozenset(("new", "create", "make"))
+    closeWords = frozenset(("close", "delete", "remove"))
+    runWords = frozenset(("compile", "run", "execute"))
+
+    # Directions the cursor can be moved in by a number of places or lines
+    # and the text index each moves it to, in the order they are checked
+    cursorMoves = {"right": "insert+%sc", "left": "insert-%sc", "up": "insert-%sl", "down": "insert+%sl"}
+
+    # Text indexes the cursor can be moved to, by whether the start or end was
+    # asked for and whether it was of the line (true) or of the file (false)
+    cursorPositions = {("start", True): "insert linestart", ("end", True): "insert lineend", ("start", False): "0.0", ("end", False): "end"}
+
+    # Regular expression matching a whole number said as digits
+    numberPattern = re.compile(r"\b\d+\b")
+
+    # Number of seconds to wait for speech to start and the longest number of
+    # seconds a single command can be, so listening never blocks for long
+    listenTimeout = 5
+    phraseLimit = 15
 
     def __init__(self, root):
         # Constructor method of voice control class.
         #
         # Makes the main window passed as a parameter an attribute so that
-        # other methods of the class can access it. Also creates an empty
-        # thread to be replaced as the start method must check if the thread is
-        # alive (must be a Thread object as it contains the is_alive method).
+        # other methods of the class can access it. Also starts a single
+        # worker thread which is kept for the life of the program and waits on
+        # a queue for requests to run voice control, so a new thread is not
+        # needed for every command. The thread does not stop the program from
+        # closing.
+        #
+        # The recognizer is created once and kept for every command, along with
+        # the microphone object it was last adjusted to the background noise
+        # of. The recognizer stops listening after a shorter pause than its
+        # default as commands are short. Whether the microphone is disabled is
+        # copied from the main window whenever it changes so the worker thread
+        # can check it without using Tkinter.
         #
         # Parameters:
         #   root: The tkinter Tk object of the main window containing the UI
         #     elements to update and mic status attribute (micKilled).
 
         self.root = root
-        self.thread = Thread()
+        self.running = False
+        self.requests = Queue(maxsize=1)
+        self.worker = Thread(target=self.work, daemon=True)
+        self.worker.start()
+        self.recog = sr.Recognizer()
+        self.recog.dynamic_energy_threshold = True
+        self.recog.pause_threshold = 0.5
+        self.recog.non_speaking_duration = 0.3
+        self.calibratedMic = None
+        self.micKilled = root.micKilled.get()
+        root.micKilled.trace_add("write", self.micChanged)
+
+    def micChanged(self, *args):
+        # Mic changed method used to copy the microphone disabled status.
+        #
+        # Called on the main thread whenever the main window's mic killed
+        # variable is set and stores its value as a plain boolean attribute,
+        # which the worker thread reads instead of the Tkinter variable.
+        #
+        # Parameters:
+        #   args: The variable name, index and operation passed by the
+        #     Tkinter variable trace, which are not used.
+
+        self.micKilled = self.root.micKilled.get()
+
+    def work(self):
+        # Work method used as the body of the worker thread.
+        #
+        # Waits for a request to be added to the queue by the start method and
+        # runs the voice control method for each one, marking voice control as
+        # no longer running once it has finished. Any unexpected error is
+        # reported in the main window rather than stopping the thread, so it
+        # runs for as long as the program does.
+        #
+        # Accepts no parameters.
+
+        while True:
+            self.requests.get()
+            try:
+                self.recognize()
+            except Exception as e:
+                self.root.after(0, messagebox.showerror, "An error occurred during speech recognition", "Voice control could not complete the command. Please try again.\n\n" + str(e))
+                self.setStatus("micICO", "Microphone Ready", "Voice Control Error")
+            finally:
+                self.running = False
 
     def recognize(self):
         # Speech capture and processing method used to perform voice commands.
         #
         # Captures input from the user's default microphone until silence is
         # detected, then attempts to convert to a string. Various exceptions
-        # are handled and string is parsed to identify a command. Appropriate
-        # action is taken and status is updated in the main window. This method
-        # is executed in a new thread (by the start method) as it contains
-        # blocking functions which will cause the main window to hang and be
-        # unresponsive until listening and processing is complete.
+        # are handled and status is updated in the main window. The string is
+        # then passed to the perform method to identify a command and take the
+        # appropriate action. This method is executed in a worker thread (by
+        # the start method) as it contains blocking functions which will cause
+        # the main window to hang and be unresponsive until listening and
+        # processing is complete. Tkinter is not safe to use from other threads
+        # so all changes to the main window are scheduled to run in the main
+        # thread instead.
         #
         # Accepts no parameters.
 
-        recog = sr.Recognizer()
+        recog = self.recog
 
-        # Attempt to create microphone object. Update status and return if no
-        # microphone hardware is found
-        try:
-            mic = sr.Microphone()
-        except OSError:
-            messagebox.showerror("An error occurred during speech recognition", "Could not find a working microphone. Please connect one and try again.")
-            self.root.micButton.config(image=self.root.nomicICO, text="Microphone Offline")
-            self.root.statusbar.config(text="Microphone Offline")
+        # Use the microphone object found by the main window, which only looks
+        # for a microphone when the program starts or the microphone is
+        # refreshed. Update status and return if no microphone hardware was
+        # found
+        mic = self.root.probeMic()
+        if mic is None:
+            self.micError()
             return
 
-        # Update UI and play a sound to show the software is listening
-        self.root.micButton.config(image=self.root.listenICO, text="Listening...")
-        self.root.statusbar.config(text="Listening...")
+        # Adjust the recognizer to the level of background noise the first
+        # time a microphone is used. Later commands keep adjusting it
+        # automatically as they listen. Have the main thread check for a
+        # microphone again, update status and return if it can no longer be
+        # opened, such as if it has been unplugged
+        if self.calibratedMic is not mic:
+            try:
+                with mic as micObj:
+                    recog.adjust_for_ambient_noise(micObj, duration=0.3)
+            except OSError:
+                self.root.after(0, self.root.probeMic, True)
+                self.micError()
+                return
+            self.calibratedMic = mic
+
+        # Update UI and play a sound to show the software is listening. The
+        # sound finishes playing before listening starts so it is not recorded
+        self.setStatus("listenICO", "Listening...", "Listening...")
         playsound("resources/mic.mp3")
 
-        # Record sound until silent using microphone object into audio object
-        with mic as micObj:
-            # Blocking call until listening complete
-            audio = recog.listen(micObj)
+        # Record sound until silent using microphone object into audio object.
+        # Recording stops early if no speech starts within the timeout or the
+        # command goes on for longer than the phrase limit. Have the main
+        # thread check for a microphone again, update status and return if it
+        # can no longer be opened
+        try:
+            with mic as micObj:
+                # Blocking call until listening complete
+                try:
+                    audio = recog.listen(micObj, timeout=Speech.listenTimeout, phrase_time_limit=Speech.phraseLimit)
+                except sr.WaitTimeoutError:
+                    audio = None
+        except OSError:
+            self.root.after(0, self.root.probeMic, True)
+            self.micError()
+            return
+
+        # Update UI and return if nothing was said before the timeout, unless
+        # the mic has been disabled during listening
+        if audio is None:
+            if not self.micKilled:
+                self.setStatus("micICO", "Microphone Ready", "Nothing Heard")
+            return
 
         # Update UI and play sound again once listening is complete or return
-        # from method if the mic has been disabled during listening.
-        if not self.root.micKilled.get():
-            playsound("resources/mic.mp3")
-            self.root.micButton.config(image=self.root.internetICO, text="Processing...")
-            self.root.statusbar.config(text="Processing...")
+        # from method if the mic has been disabled during listening. The UI
+        # update is queued first so the main window can show it while the
+        # sound starts and the transcript is requested, and the sound plays in
+        # the background so recognition does not wait for it to end
+        if not self.micKilled:
+            self.setStatus("internetICO", "Processing...", "Processing...")
+            playsound("resources/mic.mp3", False)
         else:
             return
 
         # Attempt to transcribe captured audio to a string and catch errors
         try:
             # Blocking call until recognition complete
-            said = recog.recognize_google(audio, language="en-GB").replace("open bracket", "(").replace("close bracket", ")").replace("colon", ":").replace("comma", ",")
+            said = recog.recognize_google(audio, language="en-GB")
         except sr.UnknownValueError:
             # Update UI and return if no
-            self.root.micButton.config(image=self.root.micICO, text="Microphone Ready")
-            self.root.statusbar.config(text="Couldn't Understand")
+            self.setStatus("micICO", "Microphone Ready", "Couldn't Understand")
             return
         except sr.RequestError:
             # Update UI and return if the recognize request failed
-            self.root.micButton.config(image=self.root.nointernetICO, text="Internet Offline")
-            self.root.statusbar.config(text="Internet Offline")
+            self.setStatus("nointernetICO", "Internet Offline", "Internet Offline")
             return
 
+        # Replace spoken punctuation with the symbols it represents
+        said = Speech.punctuationPattern.sub(lambda match: Speech.punctuation[match.group()], said)
+
+        # Perform the spoken command in the main thread
+        self.root.after(0, self.perform, said)
+
+    def micError(self):
+        # Mic error method used to report that no working microphone is found.
+        #
+        # Schedules an error message box to be shown in the main thread and
+        # updates the status in the main window to show the microphone is
+        # offline.
+        #
+        # Accepts no parameters.
+
+        self.root.after(0, messagebox.showerror, "An error occurred during speech recognition", "Could not find a working microphone. Please connect one and try again.")
+        self.setStatus("nomicICO", "Microphone Offline", "Microphone Offline")
+
+    def perform(self, said):
+        # Perform method used to carry out a transcribed voice command.
+        #
+        # Updates the status in the main window to show what was transcribed
+        # then parses the transcript to identify a command and takes the
+        # appropriate action on the current code editor tab or the main window.
+        # Runs in the main thread as it uses the Tkinter widgets directly.
+        #
+        # Parameters:
+        #   said: A string holding the transcript of the voice command.
+
         # Update UI button to show the microphone is ready again and the status
         # bar to show what was transcribed
-        self.root.micButton.config(image=self.root.micICO, text="Microphone Ready")
-        self.root.statusbar.config(text="Heard: \"" + said + "\"")
+        self.showStatus("micICO", "Microphone Ready", "Heard: \"" + said + "\"")
 
         # said = "please move the cursor up by 7 places"
 
-        # If the spoken command contains the word 'type' insert the proceeding
-        # string to the code editor and update syntax highlighting
-        if "type " in said and len(self.root.notebook.tabs()) > 0:
-            self.root.notebook.nametowidget(self.root.notebook.select()).text.insert("insert", said[said.find("type ") + 5:])
-            self.root.notebook.nametowidget(self.root.notebook.select()).syntaxHighlight()
+        # Split the transcript into words once, keeping a lower case set of them
+        # so each command word can be found with a single lookup rather than
+        # searching the whole transcript again for every command
+        words = said.split()
+        low = said.lower()
+        lowWords = low.split()
+        wordSet = set(lowWords)
+
+        # Get whether any code editor tabs are open, the current tab and its
+        # text field once from the main window, which keeps track of the open
+        # tabs and the selected one
+        hasTab = len(self.root.pages) > 0
+        page = self.root.currentPage
+        text = page.text if hasTab else None
+
+        # If the spoken command contains the word 'type' insert the words that
+        # follow it to the code editor and update syntax highlighting
+        if "type" in wordSet and hasTab:
+            text.insert("insert", " ".join(words[lowWords.index("type") + 1:]))
+            page.syntaxHighlight()
         # If the spoken command contains the word 'cursor' get magnitude and
         # direction then move the cursor if valid
-        elif "cursor " in said and len(self.root.notebook.tabs()) > 0:
-            # Identify amount to move cursor or use 1 if unable to find number
-            for word in said[said.find("cursor ") + 7:].split(" "):
-                if word.isdigit():
-                    by = word
+        elif "cursor" in wordSet and hasTab:
+            # Find the words following 'cursor' once
+            after = set(lowWords[lowWords.index("cursor") + 1:])
+
+            # Identify amount to move cursor from the first number after the
+            # word 'cursor' or use 1 if unable to find number
+            number = Speech.numberPattern.search(low, low.index("cursor") + 6)
+            by = number.group() if number is not None else "1"
+
+            # Move cursor right, left, up or down by the specified number of
+            # places or lines if one of those directions was said, otherwise
+            # move it to the start or end of the line if 'line' was said or of
+            # the file if not
+            for direction, move in Speech.cursorMoves.items():
+                if direction in after:
+                    text.mark_set("insert", move % by)
                     break
             else:
-                by = "1"
-
-            # Move cursor to the right by specified number of places
-            if "right" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "insert" + "+" + by + "c")
-            # Move cursor to the left by specified number of places
-            elif "left" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "insert" + "-" + by + "c")
-            # Move cursor up the specified number of lines
-            elif "up" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "insert" + "-" + by + "l")
-            # Move cursor down the specified number of lines
-            elif "down" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "insert" + "+" + by + "l")
-            # Move cursor to the start of the line
-            elif "start" in said[said.find("cursor ") + 7:] and "line" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "insert" + " linestart")
-            # Move cursor to the end of the line
-            elif "end" in said[said.find("cursor ") + 7:] and "line" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "insert" + " lineend")
-            # Move cursor to the start of the file
-            elif "start" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "0.0")
-            # Move cursor to the end of the file
-            elif "end" in said[said.find("cursor ") + 7:]:
-                self.root.notebook.nametowidget(self.root.notebook.select()).text.mark_set("insert", "end")
+                for position in ("start", "end"):
+                    if position in after:
+                        text.mark_set("insert", Speech.cursorPositions[position, "line" in after])
+                        break
         # If the spoken command contains the word 'save' call the save method
         # of the current tab to either save or save as
-        elif "save" in said and len(self.root.notebook.tabs()) > 0:
-            self.root.notebook.nametowidget(self.root.notebook.select()).save()
+        elif "save" in wordSet and hasTab:
+            page.save()
         # If the spoken command contains 'new/create/make' and 'tab' create a
         # new code editor object parented to the main window's notebook
-        elif (("new" in said and "tab" in said) or ("create" in said and "tab" in said) or ("make" in said and "tab" in said)) and len(self.root.notebook.tabs()) > 0:
+        elif "tab" in wordSet and not Speech.newWords.isdisjoint(wordSet) and hasTab:
             Page(self.root.notebook, textFont=self.root.pageFont)
         # If the spoken command contains 'close/delete/remove' and 'tab' call
         # the close method of the current tab to close it prompting save if
         # required
-        elif (("close" in said and "tab" in said) or ("delete" in said and "tab" in said) or ("remove" in said and "tab" in said)) and len(self.root.notebook.tabs()) > 0:
-            self.root.notebook.nametowidget(self.root.notebook.select()).close()
+        elif "tab" in wordSet and not Speech.closeWords.isdisjoint(wordSet) and hasTab:
+            page.close()
         # If the spoken command contains the word 'open' create the open file
         # dialogue
-        elif "open" in said and len(self.root.notebook.tabs()) > 0:
+        elif "open" in wordSet and hasTab:
             self.root.openFileDialogue()
         # If the spoken command contains the word 'compile/run/execute' call
         # the run method of the current tab to execute the program
-        elif ("compile" in said or "run" in said or "execute" in said) and len(self.root.notebook.tabs()) > 0:
-            self.root.notebook.nametowidget(self.root.notebook.select()).run()
+        elif not Speech.runWords.isdisjoint(wordSet) and hasTab:
+            page.run()
+
+    def setStatus(self, icon, buttonText, statusText):
+        # Set status method used to update the main window from the worker.
+        #
+        # Schedules the show status method to run in the main thread with the
+        # parameters given, so the microphone button and statusbar are only
+        # ever changed by the thread running the main window. Both are updated
+        # together by one callback which runs when the main window is next idle,
+        # just before it is redrawn.
+        #
+        # Parameters:
+        #   icon: A string holding the name of the main window's attribute
+        #     containing the icon to show on the microphone button.
+        #   buttonText: A string holding the text of the microphone button.
+        #   statusText: A string holding the text to show in the statusbar.
+
+        self.root.after_idle(self.showStatus, icon, buttonText, statusText)
+
+    def showStatus(self, icon, buttonText, statusText):
+        # Show status method used to update the microphone button and status.
+        #
+        # Sets the icon and text of the microphone button in the toolbar and
+        # the text of the statusbar. Must be called from the main thread.
+        #
+        # Parameters:
+        #   icon: A string holding the name of the main window's attribute
+        #     containing the icon to show on the microphone button.
+        #   buttonText: A string holding the text of the microphone button.
+        #   statusText: A string holding the text to show in the statusbar.
+
+        self.root.micButton.config(image=getattr(self.root, icon), text=buttonText)
+        self.root.statusbar.config(text=statusText)
 
     def start(self):
-        # Begin voice control method used to start and handle threads.
+        # Begin voice control method used to start voice control.
         #
-        # Checks to see if the voice control thread belonging to the object is
-        # not currently running and if the microphone is not disabled. If both
-        # conditions are met, the thread object is overwritten with a new one
-        # using the above blocking recognise function as its target and is
-        # started. This is the main method that will be called to invoke voice
-        # control.
+        # Checks to see if the voice control method is not currently running
+        # and if the microphone is not disabled. If both conditions are met, a
+        # request is added to the queue for the worker thread to run the above
+        # blocking recognise method. This is the main method that will be
+        # called to invoke voice control.
         #
         # Accepts no parameters.
 
-        if not self.thread.is_alive() and not self.root.micKilled.get():
-            self.thread = Thread(target=self.recognize)
-            self.thread.start()
+        if not self.running and not self.root.micKilled.get():
+            self.running = True
+            try:
+                self.requests.put_nowait(True)
+            except Full:
+                pass
@@ -19,12 +19,21 @@
 #      population.
 #   shutil: Simply allows deleting of entire directories as the os
 #     library does not provide ths functionality.
+#   stat: Interprets the mode of a file's details to check whether the
+#     path it belongs to is a directory.
+#   threading: Adds multithreading support so directories can be listed
+#     in a background thread without the window hanging.
+#   queue: Passes the results of background threads back to the main
+#     thread.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 import time
 import os
 import shutil
+import stat
+from threading import Thread
+from queue import Queue, Empty
 
 
 class FileTree(tk.Frame):
@@ -41,10 +50,31 @@ class FileTree(tk.Frame):
     # Contains methods tree population, toolbar button actions and creating
     # dialogues.
 
+    # File extensions with their own tree icon and the name of the icon
+    # attribute to use, any other extension uses the plain file icon
+    fileIcons = {"py": "pyICO", "pyw": "pyICO", "json": "jsonICO", "csv": "csvICO", "jpeg": "imgICO", "jpg": "imgICO", "png": "imgICO", "gif": "imgICO", "tiff": "imgICO"}
+
+    # Formatted last modified dates keyed by the minute they represent so
+    # items modified in the same minute share one formatted string, and
+    # the largest number of dates kept before it is emptied
+    dateCache = {}
+    MAX_DATE_CACHE = 4096
+
+    # Sizes in bytes of each unit item sizes are shown in, largest first
+    sizeUnits = ((1073741824, "GB"), (1048576, "MB"), (1024, "KB"))
+
+    # Icon image objects keyed by their resource filename, loaded once and
+    # shared by every file tree
+    icons = {}
+
+    # Number of milliseconds between checks for results from background
+    # threads while any are running
+    POLL_INTERVAL = 50
+
     def __init__(self, root, onOpen=lambda path: None, initPath="/"):
         # Constructor method of file tree widget.
         #
-        # Sets up image objects used for tree and toolbar button icons as
+        # Gets the image objects used for tree and toolbar button icons as
         # attributes so they are accessible by other methods. Also creates the
         # UI elements which form the widget (toolbar frame and buttons, tree
         # and scrollbar). Creates the drive (root node) using the initial path
@@ -61,25 +91,49 @@ class FileTree(tk.Frame):
 
         self.onOpen = onOpen
 
-        # Create toolbar button icon image objects
-        self.openICO = tk.PhotoImage(file="resources/open.png")
-        self.delICO = tk.PhotoImage(file="resources/del.png")
-        self.newICO = tk.PhotoImage(file="resources/new.png")
-        self.newdirICO = tk.PhotoImage(file="resources/newdir.png")
-        self.cdICO = tk.PhotoImage(file="resources/cd.png")
-
-        # Create tree item icon image objects
-        self.driveICO = tk.PhotoImage(file="resources/drive.png")
-        self.dirICO = tk.PhotoImage(file="resources/folder.png")
-        self.pyICO = tk.PhotoImage(file="resources/py.png")
-        self.fileICO = tk.PhotoImage(file="resources/file.png")
-        self.imgICO = tk.PhotoImage(file="resources/img.png")
-        self.jsonICO = tk.PhotoImage(file="resources/json.png")
-        self.csvICO = tk.PhotoImage(file="resources/csv.png")
-
-        # Define tree element with its last modified date, type, size and path
-        # columns for each node. Hide path column as only used internally
-        self.tree = ttk.Treeview(self, columns=("date", "type", "size", "path"), displaycolumns=("date", "type", "size"))
+        # Set of IDs of nodes whose contents have been or are being listed,
+        # so expanding them again does not rescan the directory
+        self.populated = set()
+
+        # Number of times each node's contents have been inserted keyed by
+        # node ID, so a deletion can tell whether its parent was listed again
+        # while it ran
+        self.listings = {}
+
+        # Drive generation, increased whenever the drive is changed so
+        # directory scans started before the change are discarded
+        self.generation = 0
+
+        # Path and type of each node in the tree keyed by node ID, kept
+        # alongside the tree so they can be read without querying the widget
+        self.nodes = {}
+
+        # Queue of results posted by background threads, each a method and
+        # its arguments to call on the main thread, along with the number of
+        # threads yet to post a result and the scheduled check for results
+        self.results = Queue()
+        self.pending = 0
+        self.pollJob = None
+
+        # Get toolbar button icon image objects
+        self.openICO = self.loadIcon("open.png")
+        self.delICO = self.loadIcon("del.png")
+        self.newICO = self.loadIcon("new.png")
+        self.newdirICO = self.loadIcon("newdir.png")
+        self.cdICO = self.loadIcon("cd.png")
+
+        # Get tree item icon image objects
+        self.driveICO = self.loadIcon("drive.png")
+        self.dirICO = self.loadIcon("folder.png")
+        self.pyICO = self.loadIcon("py.png")
+        self.fileICO = self.loadIcon("file.png")
+        self.imgICO = self.loadIcon("img.png")
+        self.jsonICO = self.loadIcon("json.png")
+        self.csvICO = self.loadIcon("csv.png")
+
+        # Define tree element with its last modified date, type and size
+        # columns for each node
+        self.tree = ttk.Treeview(self, columns=("date", "type", "size"))
 
         # Set initial width of visible columns
         self.tree.column("#0", width=100)
@@ -102,7 +156,7 @@ class FileTree(tk.Frame):
 
         # Define each of the toolbar buttons with their appropriate icon and
         # function
-        openButton = tk.Button(toolbar, image=self.openICO, relief="groove", command=self.nodeOpen)
+        openButton = tk.Button(toolbar, image=self.openICO, relief="groove", command=lambda: self.nodeOpen(True))
         delButton = tk.Button(toolbar, image=self.delICO, relief="groove", command=self.delItem)
         newButton = tk.Button(toolbar, image=self.newICO, relief="groove", command=lambda: self.dialogue(0))
         newdirButton = tk.Button(toolbar, image=self.newdirICO, relief="groove", command=lambda: self.dialogue(1))
@@ -127,150 +181,437 @@ class FileTree(tk.Frame):
         # and date modified obtained from the filesystem. Insert a placeholder
         # child removed in population to mark the drive as an expandable node
         date = time.strftime("%d/%m/%Y %H:%M", time.localtime(os.path.getmtime(initPath)))
-        drive = self.tree.insert("", 1, text=os.path.abspath(initPath), values=(date, "Drive", "", initPath), image=self.driveICO)
+        drive = self.tree.insert("", 1, text=os.path.abspath(initPath), values=(date, "Drive", ""), image=self.driveICO)
+        self.nodes[drive] = (initPath, "Drive")
         self.tree.insert(drive, 1)
 
-        # Perform initial population of the drive/root node
-        self.nodePopulate(drive)
+        # Perform initial population of the drive/root node once the window
+        # is ready
+        self.after_idle(self.nodePopulate, drive)
+
+    def loadIcon(self, file):
+        # Load icon method used to get the image object for an icon file.
+        #
+        # Returns the shared image object already loaded from the file if
+        # there is one, otherwise loads the image from the resources
+        # directory and keeps it for any later file trees. An image loaded
+        # for a different Tk instance is loaded again as it cannot be shown.
+        #
+        # Parameters:
+        #   file: A string containing the filename of the icon within the
+        #     resources directory.
+
+        icon = self.icons.get(file)
+        if icon is None or icon.tk is not self.tk:
+            icon = self.icons[file] = tk.PhotoImage(master=self, file="resources/" + file)
+        return icon
 
-    def nodePopulate(self, selected):
+    def nodePopulate(self, selected, force=False):
         # Node Populate method used to insert directory's contents in the tree.
         #
-        # Expands the node with the provided ID and deletes all of its
-        # children. Attempts to iterate over the contents of the directory at
-        # the path associated with the node and inserts each item with the
-        # appropriate icon based on directory/file type as children of the
-        # specified node alongside their details (date modified, size, type and
-        # full path). Should an error occur, a message box is shown and
-        # population halted.
+        # Expands the node with the provided ID and, unless it has already
+        # been populated and a refresh is not forced, starts a background
+        # thread which lists the directory at the path associated with the
+        # node. The listing is passed back to the main thread to be inserted
+        # by the insert rows method below so the window does not hang while
+        # the filesystem is read.
         #
         # Parameters:
         #   selected: A string representing the ID of the directory node to
         #     populate within the tree.
+        #   force: A boolean, True to rescan the directory even if the node
+        #     has already been populated.
 
         # Expand the specified node
         self.tree.item(selected, open=True)
 
-        # Delete the specified node's contents (can be placeholder contents)
-        for i in self.tree.get_children(selected):
-            self.tree.delete(i)
+        # Return from function if the node's contents are already listed or
+        # being listed
+        if selected in self.populated and not force:
+            return
+        self.populated.add(selected)
 
-        nodePath = self.tree.item(selected)["values"][3]
+        # Scan the node's directory in a background thread, tagged with the
+        # current drive generation so results for an old drive are ignored
+        nodePath = self.nodes[selected][0]
+        self.startThread(self.scanDir, (selected, nodePath, self.generation))
+
+    def startThread(self, target, args):
+        # Start thread method used to run a method in a background thread.
+        #
+        # Starts a thread running the method provided, which must put exactly
+        # one result in the results queue when it finishes. Schedules the
+        # check results method below to collect results on the main thread if
+        # it is not already scheduled, so Tkinter is never called from the
+        # background thread.
+        #
+        # Parameters:
+        #   target: The method to run in the background thread.
+        #   args: A tuple of the arguments to pass to the method.
+
+        self.pending += 1
+        if self.pollJob is None:
+            self.pollJob = self.after(self.POLL_INTERVAL, self.checkResults)
+        Thread(target=target, args=args, daemon=True).start()
+
+    def checkResults(self):
+        # Check results method used to handle results from background threads.
+        #
+        # Runs on the main thread. Takes every result currently in the results
+        # queue and calls the method it contains with its arguments, then
+        # checks again shortly if any background threads have not yet
+        # finished.
+        #
+        # Accepts no parameters.
+
+        self.pollJob = None
+
+        while True:
+            try:
+                method, args = self.results.get_nowait()
+            except Empty:
+                break
+            self.pending -= 1
+            method(*args)
+
+        if self.pending > 0 and self.pollJob is None:
+            self.pollJob = self.after(self.POLL_INTERVAL, self.checkResults)
+
+    def scanDir(self, selected, nodePath, generation):
+        # Scan directory method used to list a directory's contents for a node.
+        #
+        # Runs in a background thread so makes no calls to Tkinter widgets.
+        # Attempts to iterate over the contents of the directory at the path
+        # provided and builds a row for each item with its name, details (date
+        # modified, type, size and full path) and the icon to show based on
+        # directory/file type. Directory and file rows are kept apart so the
+        # rows, directories first, can then be passed to the insert rows
+        # method on the main thread. Items which cannot be read are listed
+        # with an unknown date and size. Should the directory itself not be
+        # readable, or the scan fail for any other reason, the failure is
+        # passed to the main thread instead.
+        #
+        # Parameters:
+        #   selected: A string representing the ID of the directory node the
+        #     contents belong to.
+        #   nodePath: A string containing the path of the directory to list.
+        #   generation: An integer representing the drive generation the scan
+        #     was started in.
+
+        dirs = []
+        files = []
+        rows = None
 
         try:
-            # Attempt to iterate over directory contents of node's path
-            for num, name in enumerate(os.listdir(nodePath)):
-                # Add path of selected node to name of item to form new path
-                path = nodePath + name
-
-                # Get the date last modified of item from the filesystem and
-                # format
-                date = time.strftime("%d/%m/%Y %H:%M", time.localtime(os.path.getmtime(path)))
-
-                # Get the size of item from the filesystem and convert to
-                # gigabytes, megabytes, kilobytes or leave as bytes if small
-                size = os.path.getsize(path)
-                if size >= 1000000000:
-                    size = str(round(size / 1000000000, 2)) + "GB"
-                elif size >= 1000000:
-                    size = str(round(size / 1000000, 2)) + "MB"
-                elif size >= 1000:
-                    size = str(round(size / 1000, 2)) + "KB"
-                else:
-                    size = str(size) + "B"
-
-                if os.path.isdir(path):
-                    # If the item is a directory, insert a node with the values
-                    # found above into the specified node and insert a placeholder
-                    # child to it to mark it as expandable
-                    directory = self.tree.insert(selected, num + 1, text=name, values=(date, "Directory", size, path + "/"), image=self.dirICO)
-                    self.tree.insert(directory, 1)
-                else:
-                    # If the item is a file, first find the file type and icon
-                    # to use based of its extension
-                    ftype = (name.split(".")[1].upper() + " File") if "." in name else "File"
-                    if ftype in ["PY File", "PYW File"]:
-                        img = self.pyICO
-                    elif ftype == "JSON File":
-                        img = self.jsonICO
-                    elif ftype == "CSV File":
-                        img = self.csvICO
-                    elif ftype in ["JPEG File", "JPG File", "PNG File", "GIF File", "TIFF File"]:
-                        img = self.imgICO
+            # Attempt to iterate over directory contents of node's path. Each
+            # entry from the scan already holds its name, full path and type,
+            # so only one (cached) stat is needed for the date and size
+            with os.scandir(nodePath) as entries:
+                for entry in entries:
+                    name = entry.name
+                    path = entry.path
+
+                    # Attempt to stat the item, showing its date and size as
+                    # unknown if it cannot be read rather than halting the
+                    # whole listing
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        date = size = "-"
                     else:
-                        img = self.fileICO
+                        # Get the date last modified of item from the stat result
+                        # and format, reusing the string for a minute already seen
+                        minute = int(st.st_mtime // 60)
+                        date = self.dateCache.get(minute)
+                        if date is None:
+                            if len(self.dateCache) >= self.MAX_DATE_CACHE:
+                                self.dateCache.clear()
+                            date = time.strftime("%d/%m/%Y %H:%M", time.localtime(minute * 60))
+                            self.dateCache[minute] = date
+
+                        # Get the size of item from the stat result and convert to
+                        # the largest unit it fills or leave as bytes if small
+                        size = st.st_size
+                        for scale, unit in self.sizeUnits:
+                            if size >= scale:
+                                size = str(round(size / scale, 2)) + unit
+                                break
+                        else:
+                            size = str(size) + "B"
+
+                    # Find whether the item is a directory, treating it as a
+                    # file if that cannot be read
+                    try:
+                        isDir = entry.is_dir()
+                    except OSError:
+                        isDir = False
+
+                    if isDir:
+                        # If the item is a directory, add a row with the values
+                        # found above and the directory icon
+                        dirs.append((name, date, "Directory", size, path + "/", "dirICO"))
+                    else:
+                        # If the item is a file, first find the file type and icon
+                        # to use based of its extension
+                        ext = os.path.splitext(name)[1][1:].lower()
+                        ftype = (ext.upper() + " File") if ext else "File"
+
+                        # Then add a row with the values found above
+                        files.append((name, date, ftype, size, path, self.fileIcons.get(ext, "fileICO")))
+
+            # Put directories before files in the completed listing
+            rows = dirs + files
+        except OSError:
+            # Leave the rows as None to report the failure if the directory
+            # cannot be listed
+            rows = None
+        finally:
+            # Always pass the listing (or failure) to the main thread to be
+            # inserted, even if the scan stopped due to an unexpected error
+            self.results.put((self.insertRows, (selected, rows, generation)))
+
+    def insertRows(self, selected, rows, generation):
+        # Insert rows method used to add a directory listing to the tree.
+        #
+        # Runs on the main thread once a background scan finishes. Ignores
+        # the listing if the drive has changed or the node was deleted since
+        # the scan started. Otherwise deletes all of the node's children and
+        # inserts each row as a child of the node with its details and icon,
+        # inserting a placeholder child under directories to mark them as
+        # expandable, counting the listing against the node. Should the scan
+        # have failed, a message box is shown.
+        #
+        # Parameters:
+        #   selected: A string representing the ID of the directory node to
+        #     populate within the tree.
+        #   rows: A list of tuples each containing an item's name, date
+        #     modified, type, size, path and icon attribute name, or None if
+        #     the scan failed.
+        #   generation: An integer representing the drive generation the scan
+        #     was started in.
+
+        # Return from function if the listing is out of date
+        if generation != self.generation or not self.tree.exists(selected):
+            return
 
-                    # Then insert a node with the values found above into the
-                    # specified node
-                    self.tree.insert(selected, num + 1, text=name, values=(date, ftype, size, path), image=img)
-        except:
-            # Display messagebox if an error occurs then halt population
+        if rows is None:
+            # Display messagebox if the scan failed, collapsing the node and
+            # allowing it to be scanned again next time it is expanded
+            self.populated.discard(selected)
+            self.tree.item(selected, open=False)
             messagebox.showerror("Error Opening Directory", "An error occurred when opening the directory \"" + self.tree.item(selected)["text"] + "\". Ensure the directory exists and you have permission.")
+            return
+
+        # Delete the specified node's contents (can be placeholder contents)
+        # and count the new listing
+        for i in self.tree.get_children(selected):
+            self.deleteNode(i)
+        self.listings[selected] = self.listings.get(selected, 0) + 1
+
+        for num, (name, date, ftype, size, path, icon) in enumerate(rows):
+            # Insert a node with the row's values and icon into the specified
+            # node
+            item = self.tree.insert(selected, num + 1, text=name, values=(date, ftype, size), image=getattr(self, icon))
+            self.nodes[item] = (path, ftype)
+
+            # Insert a placeholder child to directories to mark them as
+            # expandable
+            if ftype == "Directory":
+                self.tree.insert(item, 1)
+
+    def deleteNode(self, item):
+        # Delete node method used to remove a node and its contents.
+        #
+        # Deletes the node with the provided ID from the tree along with all
+        # of its descendants, removing each of them from the stored node paths
+        # and types, the listing counts and the set of populated nodes.
+        #
+        # Parameters:
+        #   item: A string representing the ID of the node to delete.
+
+        # Forget each of the node's children and their own contents first
+        for child in self.tree.get_children(item):
+            self.deleteNode(child)
+
+        # Forget the node itself then remove it from the tree
+        self.nodes.pop(item, None)
+        self.listings.pop(item, None)
+        self.populated.discard(item)
+        self.tree.delete(item)
 
-    def nodeOpen(self):
+    def nodeOpen(self, force=False):
         # Node open method used the open or expand the currently selected node.
         #
         # Calls the above populate function to expand the selected node if it
         # represents a directory/drive or calls the open file function passed
         # to the constructor with the selected node's path as a parameter if it
-        # represents a file.
+        # represents a file. Expanding a node only lists its directory the
+        # first time, while the toolbar open button forces a refresh.
         #
-        # Accepts no parameters.
+        # Parameters:
+        #   force: A boolean, True to rescan the selected directory even if it
+        #     has already been populated.
 
-        # Return from function if node is selected
-        if len(self.tree.selection()) == 0:
+        # Return from function if no node (other than a placeholder) is
+        # selected
+        selection = self.tree.selection()
+        if len(selection) == 0 or selection[0] not in self.nodes:
             return
 
-        # Get the ID of the first selected node
-        selected = self.tree.selection()[0]
+        # Get the ID of the first selected node and its path and type
+        selected = selection[0]
+        path, ftype = self.nodes[selected]
 
-        if self.tree.item(selected)["values"][1] in ["Directory", "Drive"]:
+        if ftype in ["Directory", "Drive"]:
             # Expand and populate the node if it is a directory or drive
-            self.nodePopulate(selected)
+            self.nodePopulate(selected, force)
         else:
             # Pass the node's path to the function provided in the constructor
             # if it is a file of any type
-            self.onOpen(self.tree.item(selected)["values"][3])
+            self.onOpen(path)
 
     def delItem(self):
         # Delete item method used to delete the selected file or directory.
         #
         # Displays a message box asking the user to confirm deletion and if yes
         # is pressed, the file or directory the currently selected node
-        # represents is deleted and the node removed. Should an error occur,
+        # represents is deleted and the node removed. Directories are deleted
+        # in a background thread with the node hidden straight away, as large
+        # directories can take a while to remove. Should an error occur,
         # another message box is shown and deletion cancelled.
         #
         # Accepts no parameters.
 
-        # Return from function if node is selected
-        if len(self.tree.selection()) == 0:
+        # Return from function if no node (other than a placeholder) is
+        # selected
+        selection = self.tree.selection()
+        if len(selection) == 0 or selection[0] not in self.nodes:
             return
 
-        # Get the ID of the first selected node
-        selected = self.tree.item(self.tree.selection()[0])
+        # Get the ID of the first selected node and its name, path and type
+        selected = selection[0]
+        name = self.tree.item(selected, "text")
+        path, ftype = self.nodes[selected]
 
         try:
-            if selected["values"][1] == "Directory":
+            if ftype == "Directory":
                 # If the selected node represents a directory ask the user to
                 # confirm deletion via message box
-                conf = messagebox.askquestion("Confirm Delete", "Are you sure you want to delete the entire directory \"" + selected["text"] + "\"? This action cannot be undone!", icon="warning")
+                conf = messagebox.askquestion("Confirm Delete", "Are you sure you want to delete the entire directory \"" + name + "\"? This action cannot be undone!", icon="warning")
                 if conf == "yes":
-                    # If user presses yes, attempt to delete entire directory
-                    # and remove node
-                    shutil.rmtree(selected["values"][3])
-                    self.tree.delete(self.tree.selection()[0])
+                    # If user presses yes, hide the node while remembering
+                    # where it was and how many times its parent had been
+                    # listed, then attempt to delete the entire directory in
+                    # a background thread
+                    parent = self.tree.parent(selected)
+                    index = self.tree.index(selected)
+                    listing = self.listings.get(parent, 0)
+                    self.tree.detach(selected)
+                    self.startThread(self.removeDir, (selected, name, path, parent, index, listing))
             else:
                 # If the selected node represents a file ask the user to
                 # confirm deletion via message box
-                conf = messagebox.askquestion("Confirm Delete", "Are you sure you want to delete the file \"" + selected["text"] + "\"? This action cannot be undone!", icon="warning")
+                conf = messagebox.askquestion("Confirm Delete", "Are you sure you want to delete the file \"" + name + "\"? This action cannot be undone!", icon="warning")
                 if conf == "yes":
                     # If user presses yes, attempt to delete file and remove
                     # node
-                    os.remove(selected["values"][3])
-                    self.tree.delete(self.tree.selection()[0])
-        except:
-            # Display messagebox if an error occurs then cancel deletion
-            messagebox.showerror("Error Deleting Item", "An error occurred when deleting the item \"" + selected["text"] + "\". Ensure that it exists and you have permission.")
+                    os.remove(path)
+                    self.deleteNode(selected)
+        except OSError as e:
+            # Display messagebox with the reason if an error occurs then cancel
+            # deletion
+            messagebox.showerror("Error Deleting Item", "An error occurred when deleting the item \"" + name + "\". Ensure that it exists and you have permission.\n\n" + str(e))
+
+    def removeDir(self, selected, name, path, parent, index, listing):
+        # Remove directory method used to delete a directory and its contents.
+        #
+        # Runs in a background thread so makes no calls to Tkinter widgets.
+        # Attempts to delete the entire directory at the path provided, then
+        # always passes the result (and the reason should an error occur) to
+        # the remove finished method on the main thread.
+        #
+        # Parameters:
+        #   selected: A string representing the ID of the hidden node of the
+        #     directory being deleted.
+        #   name: A string containing the name of the directory.
+        #   path: A string containing the path of the directory to delete.
+        #   parent: A string representing the ID of the node's parent.
+        #   index: An integer representing the node's position in its parent.
+        #   listing: An integer representing the number of times the parent
+        #     had been listed when the deletion started.
+
+        error = "The deletion did not complete."
+        try:
+            shutil.rmtree(path)
+            error = None
+        except OSError as e:
+            error = str(e)
+        finally:
+            self.results.put((self.removeFinished, (selected, name, parent, index, listing, error)))
+
+    def removeFinished(self, selected, name, parent, index, listing, error):
+        # Remove finished method used to update the tree once a directory has
+        # been deleted.
+        #
+        # Runs on the main thread once a background deletion finishes. If the
+        # deletion succeeded, the hidden node is removed for good. Should an
+        # error have occurred, the node is put back where it was (if its
+        # parent is still in the tree) and a message box shown. Should the
+        # parent have been listed again while the deletion ran, the node is
+        # removed instead and the parent listed once more, as its listing may
+        # already hold a new node for the directory or show it part deleted.
+        #
+        # Parameters:
+        #   selected: A string representing the ID of the hidden node of the
+        #     deleted directory.
+        #   name: A string containing the name of the directory.
+        #   parent: A string representing the ID of the node's parent.
+        #   index: An integer representing the node's position in its parent.
+        #   listing: An integer representing the number of times the parent
+        #     had been listed when the deletion started.
+        #   error: A string containing the reason the deletion failed, or
+        #     None if it succeeded.
+
+        # Restore the node if the directory could not be deleted and it still
+        # has somewhere to go in an unchanged listing, otherwise remove it and
+        # its contents
+        relisted = self.listings.get(parent, 0) != listing
+        if error is not None and self.tree.exists(parent) and not relisted:
+            self.tree.move(selected, parent, index)
+        else:
+            self.deleteNode(selected)
+
+            # List the parent again straight away if it is expanded, or next
+            # time it is expanded if not, should it have been listed during
+            # the deletion
+            if relisted and parent in self.populated:
+                if self.tree.item(parent, "open"):
+                    self.nodePopulate(parent, True)
+                else:
+                    self.populated.discard(parent)
+
+        # Display messagebox with the reason if an error occurred
+        if error is not None:
+            messagebox.showerror("Error Deleting Item", "An error occurred when deleting the item \"" + name + "\". Ensure that it exists and you have permission.\n\n" + error)
+
+    def refreshDir(self, path):
+        # Refresh directory method used to update a directory's listing.
+        #
+        # Finds the nodes in the tree which represent the directory at the path
+        # provided and have already been populated. Expanded nodes are listed
+        # again straight away, while collapsed nodes are marked as unpopulated
+        # so they are listed again the next time they are expanded.
+        #
+        # Parameters:
+        #   path: A string containing the path of the directory to refresh.
+
+        target = os.path.normcase(os.path.abspath(path))
+        for item in list(self.populated):
+            if item in self.nodes and os.path.normcase(os.path.abspath(self.nodes[item][0])) == target:
+                if self.tree.item(item, "open"):
+                    self.nodePopulate(item, True)
+                else:
+                    self.populated.discard(item)
 
     def dialogue(self, dType):
         # Dialogue method used to create a window for toolbar button actions.
@@ -290,7 +631,8 @@ class FileTree(tk.Frame):
         # path of the selected node
         path = tk.StringVar()
         name = tk.StringVar()
-        path.set(self.tree.item(self.tree.selection()[0])["values"][3] if len(self.tree.selection()) > 0 else "/")
+        selection = self.tree.selection()
+        path.set(self.nodes[selection[0]][0] if len(selection) > 0 and selection[0] in self.nodes else "/")
 
         # Create dialogue and set options
         dialogue = tk.Toplevel()
@@ -351,9 +693,10 @@ class FileTree(tk.Frame):
         # Checks if the provided path and name are valid and displays a message
         # box if validation fails. If they are valid, attempts to write an
         # empty string to a file with the name and path, closes the passed
-        # dialogue (if applicable) and calls the open function passed to the
-        # constructor with the new file's path as a parameter. Should an error
-        # occur, a message box is shown and creation cancelled.
+        # dialogue (if applicable), refreshes the parent directory's listing
+        # and calls the open function passed to the constructor with the new
+        # file's path as a parameter. Should an error occur, a message box is
+        # shown and creation cancelled.
         #
         # Parameters:
         #   path: A string containing the path of the parent directory to
@@ -363,45 +706,57 @@ class FileTree(tk.Frame):
         #   dialogue: An optional tkinter window object (toplevel/tk) to be
         #     closed upon successful creation of the file.
 
+        # Join the path and filename to form the new file's full path
+        filePath = os.path.join(path, name).replace("\\", "/")
+
         # Validate path and filename parameters
         if path == "" or name == "":
             # Cancel if either provided path or name is empty
             messagebox.showwarning("Provide a path and name", "You must provide a valid path and Filename before creating a new file")
+        elif os.path.isabs(name) or os.path.splitdrive(name)[0] or os.sep in name or (os.altsep and os.altsep in name):
+            # Cancel if the provided filename contains a path rather than
+            # just a name, so it cannot be created outside of the provided
+            # path
+            messagebox.showwarning("Invalid name", "The name you have provided contains a path. Please provide just the name of the file.")
         elif not os.path.isdir(path):
             # Cancel if provided path is not a real directory
             messagebox.showwarning("Invalid path", "The path you have provided is invalid. Please change it to a valid one.")
         elif "." not in name or name[-1] == ".":
             # Cancel if the filename contains no extension
             messagebox.showwarning("Provide a file extension", "You have not provided a file extension. Please provide one.")
-        elif os.path.exists(path + ("/" if path[-1] != "/" else "") + name):
+        elif os.path.exists(filePath):
             # Cancel if a file with proved name exists at provided path
             messagebox.showwarning("File exists", "You have provided the name and path of a file that already exists. Please amend.")
         else:
             try:
                 # If path and filename pass validation, attempt to write an
                 # empty string to a file with filename at path
-                with open(path + ("/" if path[-1] != "/" else "") + name, "w") as file:
+                with open(filePath, "w") as file:
                     file.write("")
 
                 # Close the dialogue if one is passed as a parameter
                 if dialogue:
                     dialogue.destroy()
 
+                # Show the new file in the tree
+                self.refreshDir(path)
+
                 # Pass the new file's path to the function provided in the
                 # constructor
-                self.onOpen(path + ("/" if path[-1] != "/" else "") + name)
-            except:
-                # Display messagebox if an error occurs then cancel creation
-                messagebox.showerror("An error occurred while creating file", "Could not create file. Please check you have permission.")
+                self.onOpen(filePath)
+            except (OSError, ValueError) as e:
+                # Display messagebox with the reason if an error occurs then
+                # cancel creation
+                messagebox.showerror("An error occurred while creating file", "Could not create file. Please check you have permission.\n\n" + str(e))
 
     def createFolder(self, path, name, dialogue=None):
         # Create folder method used to create a directory with provided name.
         #
         # Checks if the provided path and name are valid and displays a message
         # box if validation fails. If they are valid, attempts to create a
-        # directory with the name and path then closes the passed dialogue (if
-        # applicable). Should an error occur, a message box is shown and
-        # creation cancelled.
+        # directory with the name and path, closes the passed dialogue (if
+        # applicable) then refreshes the parent directory's listing. Should an
+        # error occur, a message box is shown and creation cancelled.
         #
         # Parameters:
         #   path: A string containing the path of the parent directory to
@@ -410,28 +765,41 @@ class FileTree(tk.Frame):
         #   dialogue: An optional tkinter window object (toplevel/tk) to be
         #     closed upon successful creation of the directory.
 
+        # Join the path and directory name to form the new directory's full
+        # path
+        dirPath = os.path.join(path, name).replace("\\", "/")
+
         # Validate path and directory name parameters
         if path == "" or name == "":
             # Cancel if either provided path or name is empty
             messagebox.showwarning("Provide a path and name", "You must provide a valid path and name before creating a new directory")
+        elif os.path.isabs(name) or os.path.splitdrive(name)[0] or os.sep in name or (os.altsep and os.altsep in name):
+            # Cancel if the provided directory name contains a path rather than
+            # just a name, so it cannot be created outside of the provided
+            # path
+            messagebox.showwarning("Invalid name", "The name you have provided contains a path. Please provide just the name of the directory.")
         elif not os.path.isdir(path):
             # Cancel if provided path is not a real directory
             messagebox.showwarning("Invalid path", "The path you have provided is invalid. Please change it to a valid one.")
-        elif os.path.isdir(path + ("/" if path[-1] != "/" else "") + name):
+        elif os.path.isdir(dirPath):
             # Cancel if a directory with proved name exists at provided path
             messagebox.showwarning("Directory exists", "You have provided the name and path of a directory that already exists. Please amend.")
         else:
             try:
                 # If path and directory name pass validation, attempt to create
                 # a directory with name at path
-                os.mkdir(path + ("/" if path[-1] != "/" else "") + name)
+                os.mkdir(dirPath)
 
                 # Close the dialogue if one is passed as a parameter
                 if dialogue:
                     dialogue.destroy()
-            except:
-                # Display messagebox if an error occurs then cancel creation
-                messagebox.showerror("An error occurred while creating directory", "Could not create directory. Please check you have permission.")
+
+                # Show the new directory in the tree
+                self.refreshDir(path)
+            except (OSError, ValueError) as e:
+                # Display messagebox with the reason if an error occurs then
+                # cancel creation
+                messagebox.showerror("An error occurred while creating directory", "Could not create directory. Please check you have permission.\n\n" + str(e))
 
     def changeDrive(self, path, dialogue=None):
         # Change drive method used to update the root node's path in the tree.
@@ -451,8 +819,15 @@ class FileTree(tk.Frame):
         #   dialogue: An optional tkinter window object (toplevel/tk) to be
         #     closed upon successful creation of the directory.
 
+        # Get the details of the provided path from the filesystem once, for
+        # both validation and the drive's date modified
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            st = None
+
         # Validate path parameter
-        if not os.path.isdir(path):
+        if st is None or not stat.S_ISDIR(st.st_mode):
             # Cancel if provided path is not a real directory
             messagebox.showwarning("Directory does not exist", "You have provided the path of a directory that does not exist. Please provide a valid directory path.")
         else:
@@ -460,18 +835,31 @@ class FileTree(tk.Frame):
             # display a message box then return if an exception is thrown
             try:
                 os.listdir(path)
-            except:
-                messagebox.showwarning("Directory is inaccessible", "You have provided the path of a directory that is not accessible. Please ensure you have permission.")
+            except OSError as e:
+                messagebox.showwarning("Directory is inaccessible", "You have provided the path of a directory that is not accessible. Please ensure you have permission.\n\n" + str(e))
                 return
 
-            # Delete the root node in the tree and its contents
+            # Delete the root node in the tree and its contents, forgetting
+            # which of its nodes were populated
             self.tree.delete(self.tree.get_children("")[0])
+            self.populated.clear()
+            self.listings.clear()
+            self.nodes.clear()
+            self.generation += 1
+
+            # Get the absolute path once for the drive's name and its stored
+            # path, which uses forward slashes and ends with one
+            absPath = os.path.abspath(path)
+            drivePath = absPath.replace("\\", "/")
+            if not drivePath.endswith("/"):
+                drivePath += "/"
 
             # Create the root node as a drive with the path provided and date
             # modified obtained from the filesystem. Insert a placeholder child
             # removed in population to mark the drive as an expandable node
-            date = time.strftime("%d/%m/%Y %H:%M", time.localtime(os.path.getmtime(path)))
-            drive = self.tree.insert("", 1, text=os.path.abspath(path), values=(date, "Drive", "", os.path.abspath(path).replace("\\", "/") + ("" if os.path.abspath(path).replace("\\", "/")[-1] == "/" else "/")), image=self.driveICO)
+            date = time.strftime("%d/%m/%Y %H:%M", time.localtime(st.st_mtime))
+            drive = self.tree.insert("", 1, text=absPath, values=(date, "Drive", ""), image=self.driveICO)
+            self.nodes[drive] = (drivePath, "Drive")
             self.tree.insert(drive, 1)
 
             # Close the dialogue if one is passed as a parameter
@@ -479,4 +867,4 @@ class FileTree(tk.Frame):
                 dialogue.destroy()
 
             # Populate the contents of the new drive
-            self.nodePopulate(drive)
+            self.nodePopulate(drive, True)